@@ -1,39 +1,116 @@
 """
 Build script for Simulation Studio addon
-Copies all files from src/ to build/SimulationStudio/ and creates ZIP
+Zips all files from src/ into build/SimulationStudio.zip (under a SimulationStudio/ folder)
+
+Usage:
+    python build_addon.py                # full build
+    python build_addon.py --incremental  # skip the ZIP if nothing in src/ changed
+    python build_addon.py --symlink      # dev mode: build/SimulationStudio links to src/
 """
 
-import shutil
 import os
+import shutil
+import subprocess
 import sys
+import time
+import zipfile
 
 # Paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SRC_DIR = os.path.join(SCRIPT_DIR, "src")
 BUILD_DIR = os.path.join(SCRIPT_DIR, "build", "SimulationStudio")
 ZIP_PATH = os.path.join(SCRIPT_DIR, "build", "SimulationStudio.zip")
+ARCHIVE_ROOT = "SimulationStudio"
+
+# Already-compressed formats: deflating them again costs time for no size win
+STORED_EXT = {".png", ".jpg", ".jpeg", ".exr", ".hdr", ".zip", ".7z"}
+DEFLATE_LEVEL = 6
+
+# Never shipped in the addon
+SKIP_DIRS = {"__pycache__"}
+SKIP_EXT = {".pyc", ".pyo"}
+SKIP_FILES = {".ss_cache.pkl", ".ss_cache.pkl.tmp"}  # preset caches left by older dev builds
+
+def collect_files():
+    """Returns {arcname: full_path} for every file under SRC_DIR"""
+    files = {}
+    for root, dirs, filenames in os.walk(SRC_DIR):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for f in filenames:
+            if f in SKIP_FILES or os.path.splitext(f)[1] in SKIP_EXT:
+                continue
+            full = os.path.join(root, f)
+            rel = os.path.relpath(full, SRC_DIR)
+            files[os.path.join(ARCHIVE_ROOT, rel).replace(os.sep, "/")] = full
+    return files
+
+def zip_is_up_to_date(files):
+    """True if ZIP_PATH already holds exactly these files with matching size and timestamp"""
+    if not os.path.exists(ZIP_PATH):
+        return False
+    try:
+        with zipfile.ZipFile(ZIP_PATH, 'r') as zf:
+            infos = {i.filename: i for i in zf.infolist()}
+    except zipfile.BadZipFile:
+        return False
+    
+    if set(infos) != set(files):
+        return False
+    for arcname, full in files.items():
+        st = os.stat(full)
+        info = infos[arcname]
+        # ZIP timestamps have 2-second resolution
+        if info.file_size != st.st_size or info.date_time != zip_date_time(st.st_mtime):
+            return False
+    return True
+
+def zip_date_time(mtime):
+    """Convert an mtime into the (rounded) tuple zipfile stores"""
+    t = time.localtime(mtime)
+    return (max(t.tm_year, 1980), t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec // 2 * 2)
+
+def link_dev_build():
+    """Make BUILD_DIR a symlink (or junction on Windows) to SRC_DIR instead of a copy"""
+    if os.path.islink(BUILD_DIR):
+        os.unlink(BUILD_DIR)
+    elif os.path.isdir(BUILD_DIR):
+        # Junctions are not reported by islink() on older Pythons; rmdir removes only the link
+        try:
+            os.rmdir(BUILD_DIR)
+        except OSError:
+            shutil.rmtree(BUILD_DIR)
+    os.makedirs(os.path.dirname(BUILD_DIR), exist_ok=True)
+    
+    try:
+        os.symlink(SRC_DIR, BUILD_DIR, target_is_directory=True)
+    except OSError:
+        if os.name != 'nt':
+            raise
+        # Symlinks need admin/dev mode on Windows; junctions don't
+        subprocess.run(['mklink', '/J', BUILD_DIR, SRC_DIR], shell=True, check=True)
+    
+    print(f"✅ Dev build linked!")
+    print(f"   {BUILD_DIR} -> {SRC_DIR}")
+    print("   Pour rafraîchir: F3 > 'Reload Scripts' ou Ctrl+Shift+F5")
 
-def build():
-    # Remove old build
-    if os.path.exists(BUILD_DIR):
-        shutil.rmtree(BUILD_DIR)
+def build(incremental=False):
+    files = collect_files()
     
-    # Copy src to build
-    shutil.copytree(SRC_DIR, BUILD_DIR)
+    if incremental and zip_is_up_to_date(files):
+        print(f"✅ Up to date, nothing to build ({ZIP_PATH})")
+        return
     
-    # Create ZIP
-    if os.path.exists(ZIP_PATH):
-        os.remove(ZIP_PATH)
-    shutil.make_archive(
-        os.path.join(SCRIPT_DIR, "build", "SimulationStudio"),
-        'zip',
-        os.path.join(SCRIPT_DIR, "build"),
-        "SimulationStudio"
-    )
+    # Write the ZIP straight from src/ (no intermediate copy)
+    os.makedirs(os.path.dirname(ZIP_PATH), exist_ok=True)
+    with zipfile.ZipFile(ZIP_PATH, 'w', zipfile.ZIP_DEFLATED, compresslevel=DEFLATE_LEVEL) as zf:
+        for arcname, full in sorted(files.items()):
+            if os.path.splitext(full)[1].lower() in STORED_EXT:
+                zf.write(full, arcname=arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.write(full, arcname=arcname)
     
     print(f"✅ Build complete!")
     print(f"   Source: {SRC_DIR}")
-    print(f"   Folder: {BUILD_DIR}")
     print(f"   ZIP:    {ZIP_PATH}")
     print()
     print("=" * 60)
@@ -57,4 +134,7 @@ def build():
     print()
 
 if __name__ == "__main__":
-    build()
+    if '--symlink' in sys.argv:
+        link_dev_build()
+    else:
+        build(incremental='--incremental' in sys.argv)
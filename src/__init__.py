@@ -9,48 +9,71 @@ bl_info = {
 }
 
 import bpy
+import importlib
 
 from . import light_engine
-from . import asset_handler
-from . import ui_panel
-from . import diagram_generator
-from . import camera_sim
-from . import asset_library
-from . import light_modifiers
-from . import geometry_nodes_scrim
 
-classes = (
-    light_engine.SS_OT_convert_to_real_light,
-    asset_handler.SS_OT_attach_to_light,
-    ui_panel.SS_PT_light_mixer,
-    diagram_generator.SS_OT_export_diagram,
-    camera_sim.SS_OT_apply_exposure,
-    camera_sim.SS_OT_reset_exposure,
-    light_modifiers.SS_OT_apply_light_preset,
-    light_modifiers.SS_OT_add_modifier,
-    light_modifiers.SS_OT_clear_modifiers,
-    light_modifiers.SS_OT_set_power,
-    light_modifiers.SS_OT_spawn_cob,
-    # light_modifiers.SS_OT_spawn_cob_poc, # Removed
-    light_modifiers.SS_OT_spawn_diffusion_frame,
-    light_modifiers.SS_OT_reload_assets,
-    light_modifiers.SS_MT_light_presets,
-    light_modifiers.SS_MT_modifier_presets,
+# Imported on register() rather than at addon import time
+_LAZY = (
+    'asset_handler',
+    'ui_panel',
+    'diagram_generator',
+    'camera_sim',
+    'asset_library',
+    'light_modifiers',
+    'geometry_nodes',
+    'geometry_nodes_scrim',
 )
+_modules = {}
+classes = ()
+
+def _build_classes(m):
+    return (
+        m['asset_library'].SS_LightProps,
+        m['asset_library'].SS_PresetItem,
+        m['ui_panel'].SS_UL_light_presets,
+        light_engine.SS_OT_convert_to_real_light,
+        m['asset_handler'].SS_OT_attach_to_light,
+        m['ui_panel'].SS_PT_light_mixer,
+        m['diagram_generator'].SS_OT_export_diagram,
+        m['camera_sim'].SS_OT_apply_exposure,
+        m['camera_sim'].SS_OT_reset_exposure,
+        m['light_modifiers'].SS_OT_apply_light_preset,
+        m['light_modifiers'].SS_OT_add_modifier,
+        m['light_modifiers'].SS_OT_clear_modifiers,
+        m['light_modifiers'].SS_OT_set_power,
+        m['light_modifiers'].SS_OT_spawn_cob,
+        # m['light_modifiers'].SS_OT_spawn_cob_poc, # Removed
+        m['light_modifiers'].SS_OT_spawn_diffusion_frame,
+        m['light_modifiers'].SS_OT_reload_assets,
+        m['light_modifiers'].SS_MT_light_presets,
+        m['light_modifiers'].SS_MT_modifier_presets,
+    )
 
 def register():
+    global classes
+    for name in _LAZY:
+        _modules[name] = importlib.import_module('.' + name, __package__)
+    classes = _build_classes(_modules)
+    
     for cls in classes:
         bpy.utils.register_class(cls)
     
     bpy.types.VIEW3D_MT_object.append(light_engine.menu_func)
+    light_engine.register_handlers()
+    _modules['geometry_nodes'].register_handlers()
+    _modules['geometry_nodes_scrim'].register_handlers()
+    _modules['ui_panel'].register_handlers()
+    _modules['light_modifiers'].register_handlers()
+    _modules['light_modifiers'].register_preset_menus()
     
     # Light Properties
+    _modules['asset_library'].register_props()
     bpy.types.Light.ss_flash_power = bpy.props.FloatProperty(
         name="Flash Power (Ws)",
         description="Power in Watt-Seconds",
         default=500.0,
-        min=0.0,
-        update=light_engine.update_light_power
+        min=0.0
     )
     
     # Camera Properties
@@ -84,18 +107,43 @@ def register():
         min=-20.0,
         max=20.0
     )
+    
+    # Scene Lights list in the panel
+    bpy.types.Scene.ss_show_lights_list = bpy.props.BoolProperty(
+        name="Show Scene Lights",
+        description="List the scene's lights in the Light Mixer panel",
+        default=True
+    )
+    
+    bpy.types.Scene.ss_lights_list_max = bpy.props.IntProperty(
+        name="Max Lights Listed",
+        description="Number of lights shown in the Scene Lights list",
+        default=25,
+        min=1
+    )
 
 def unregister():
     bpy.types.VIEW3D_MT_object.remove(light_engine.menu_func)
+    light_engine.unregister_handlers()
+    _modules['geometry_nodes'].unregister_handlers()
+    _modules['geometry_nodes_scrim'].unregister_handlers()
+    _modules['ui_panel'].unregister_handlers()
+    _modules['light_modifiers'].unregister_handlers()
+    _modules['light_modifiers'].unregister_preset_menus()
     
     del bpy.types.Light.ss_flash_power
+    _modules['asset_library'].unregister_props()
     del bpy.types.Camera.ss_iso
     del bpy.types.Camera.ss_fstop
     del bpy.types.Camera.ss_shutter_speed
     del bpy.types.Scene.ss_exposure_calibration
+    del bpy.types.Scene.ss_show_lights_list
+    del bpy.types.Scene.ss_lights_list_max
     
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+    
+    _modules.clear()
 
 if __name__ == "__main__":
     register()
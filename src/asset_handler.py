@@ -1,87 +1,86 @@
 import bpy
 import mathutils
+import mathutils.kdtree
 
 def snap_modifier_to_light(modifier_obj, threshold=0.5):
     """
     Checks if the modifier_obj is close to a Light object.
     If so, parent it to the light and reset transforms.
     """
-    # Find all lights in the scene
-    lights = [o for o in bpy.context.scene.objects if o.type == 'LIGHT']
+    # Single pass over the scene, comparing squared distances (no sqrt).
+    # Picks the nearest light, like the KD-tree query in snap_modifiers_to_lights.
+    # World positions: a rig's light location is only an offset from its parent.
+    loc = modifier_obj.matrix_world.translation
+    mx, my, mz = loc.x, loc.y, loc.z
+    thr2 = threshold * threshold
     
     closest_light = None
-    min_dist = float('inf')
+    min_dist2 = float('inf')
     
-    for light in lights:
-        dist = (light.location - modifier_obj.location).length
-        if dist < min_dist:
-            min_dist = dist
-            closest_light = light
+    for o in bpy.context.scene.objects:
+        if o.type != 'LIGHT':
+            continue
+        lo = o.matrix_world.translation
+        dx = lo.x - mx
+        dy = lo.y - my
+        dz = lo.z - mz
+        d2 = dx * dx + dy * dy + dz * dz
+        if d2 < min_dist2:
+            min_dist2 = d2
+            closest_light = o
             
-    if closest_light and min_dist < threshold:
-        # Snap!
-        modifier_obj.parent = closest_light
-        modifier_obj.matrix_parent_inverse = closest_light.matrix_world.inverted()
-        
-        # Reset location (assume origin of modifier matches mount point)
-        modifier_obj.location = (0, 0, 0)
-        
-        # Align rotation? Usually modifiers face -Y or -Z. 
-        # For now, let's keep rotation as is or zero it out.
-        modifier_obj.rotation_euler = (0, 0, 0)
-        
-        print(f"B_SIM: Snapped {modifier_obj.name} to {closest_light.name}")
+    if closest_light and min_dist2 < thr2:
+        _attach_to_light(modifier_obj, closest_light)
         return True
         
     return False
 
-# Post-operation handler to detect new objects (Drag & Drop usually triggers this)
-# Note: Blender doesn't have a direct "OnDragDrop" event for Python.
-# We rely on depsgraph_update_post or detecting new objects.
-
-from bpy.app.handlers import persistent
-
-_last_object_names = set()
-
-@persistent
-def on_depsgraph_update(scene, depsgraph):
-    # This is heavy, we need a better trigger.
-    # Alternatives: `bpy.msgbus` on 'kb_item' (unreliable).
-    # Standard way for Asset Browser drag and drop:
-    # There isn't one. The asset is appended/linked.
-    # We can check if active object changed and is a mesh?
-    pass
-
-# Better approach for Drag & Drop detection in 4.0:
-# Define an operator that runs AFTER the drop? No.
-# Use a Timer? No.
+def snap_modifiers_to_lights(modifier_objs, threshold=0.5):
+    """
+    Batch version of snap_modifier_to_light.
+    Builds a KD-tree of the scene lights once, then answers each nearest-light
+    query in O(log N). Returns the number of objects that were attached.
+    """
+    kd, lights = _light_kdtree(bpy.context.scene)
+    if not lights:
+        return 0
+    
+    attached = 0
+    for modifier_obj in modifier_objs:
+        _co, index, dist = kd.find(modifier_obj.matrix_world.translation)
+        if index is not None and dist < threshold:
+            _attach_to_light(modifier_obj, lights[index])
+            attached += 1
+    return attached
 
-# Let's use the 'depsgraph_update_post' but filter carefully.
-# Actally, standard Asset Browser drop selects the new object.
-# We can check if the active object is a Mesh and has no parent.
+def _light_kdtree(scene):
+    """Returns (kdtree, lights) indexing every light in scene by world position"""
+    lights = [o for o in scene.objects if o.type == 'LIGHT']
+    kd = mathutils.kdtree.KDTree(len(lights))
+    for i, light in enumerate(lights):
+        kd.insert(light.matrix_world.translation, i)
+    kd.balance()
+    return kd, lights
 
-@persistent
-def auto_attach_handler(scene):
-    obj = bpy.context.active_object
-    if not obj:
-        return
-        
-    # Check if we just added this object?
-    # Hard to distinguish "Just Added" from "Just Selected".
-    # But usually, when dragging an asset, it is placed at cursor or on surface.
-    
-    # We will add a manual operator "Attach to Closest Light" to be safe first,
-    # OR we try to be smart: if name implies modifier?
+def _attach_to_light(modifier_obj, light):
+    # Snap!
+    modifier_obj.parent = light
+    modifier_obj.matrix_parent_inverse = light.matrix_world.inverted_safe()
     
-    # Let's keep it simple: Add an operator `SS_OT_attach_modifier` 
-    # and maybe a modal operator that runs in background? No, that's heavy.
+    # Reset location and rotation in a single write (assume origin of
+    # modifier matches mount point). Scale is kept as-is.
+    # Usually modifiers face -Y or -Z; for now rotation is zeroed out.
+    modifier_obj.matrix_basis = mathutils.Matrix.Diagonal(modifier_obj.scale).to_4x4()
     
-    # For this POC, we will implement the logic in an operator 
-    # that the user can call, OR verify if we can hook into the Drop.
-    pass
+    print(f"B_SIM: Snapped {modifier_obj.name} to {light.name}")
+
+# Drag & Drop detection
+# Note: Blender doesn't have a direct "OnDragDrop" event for Python, and telling a
+# dropped modifier asset from the user's own meshes needs a tag nothing sets yet.
+# Until then, attaching is explicit: use the "Attach to Closest Light" operator.
 
 class SS_OT_attach_to_light(bpy.types.Operator):
-    """Attaches selected object to the closest light source"""
+    """Attaches selected objects to their closest light source"""
     bl_idname = "object.ss_attach_to_light"
     bl_label = "Attach to Closest Light"
     bl_options = {'REGISTER', 'UNDO'}
@@ -91,9 +90,17 @@ class SS_OT_attach_to_light(bpy.types.Operator):
         return context.active_object and context.active_object.type == 'MESH'
 
     def execute(self, context):
-        obj = context.active_object
-        if snap_modifier_to_light(obj):
-            self.report({'INFO'}, f"Attached to light")
+        objs = [o for o in context.selected_objects if o.type == 'MESH']
+        if context.active_object not in objs:
+            objs.append(context.active_object)
+        
+        if len(objs) == 1:
+            attached = int(snap_modifier_to_light(objs[0]))
+        else:
+            attached = snap_modifiers_to_lights(objs)
+        
+        if attached:
+            self.report({'INFO'}, f"Attached {attached} object(s) to light")
         else:
             self.report({'WARNING'}, "No light nearby to attach to")
         return {'FINISHED'}
@@ -4,14 +4,59 @@ Handles loading and managing COB light presets and modifiers from JSON files.
 """
 
 import bpy
+import bpy.utils.previews
+from bpy.app.handlers import persistent
 import os
 import json
+import pickle
 import math
+from functools import lru_cache
+from . import light_engine
+
+# orjson is used when available (not bundled with Blender); both accept raw bytes
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Whole-degree beam angles (the common case for presets) are looked up, not converted
+_DEG_TO_RAD_TABLE = tuple(math.radians(i) for i in range(181))
+
+def _deg_to_rad(d):
+    di = int(d)
+    if di == d and 0 <= di <= 180:
+        return _DEG_TO_RAD_TABLE[di]
+    return math.radians(d)
 
 # Caching variables
 _LIGHT_PRESETS_CACHE = None
 _MODIFIER_PRESETS_CACHE = None
 
+# Enum items built from the preset lists above. Rebuilt when the list object changes.
+# The module-level reference also keeps the item strings alive, which Blender
+# requires for dynamic enum callbacks.
+_LIGHT_ENUM_CACHE = None
+_LIGHT_ENUM_CACHE_FOR = None
+_MODIFIER_ENUM_CACHE = None
+_MODIFIER_ENUM_CACHE_FOR = None
+
+# Preset data by name, per preset type: {'light': {name: data}, 'modifier': {...}}
+# Built from the cached preset lists on first lookup; reset by reload_assets().
+_PRESET_OBJ_CACHE = {}
+
+# Parsed JSON per folder: {folder: {filename: (mtime_ns, size, data)}}
+# Survives reload_assets() so only changed files get re-parsed.
+_PRESET_FILE_CACHE = {}
+
+# _PRESET_FILE_CACHE is also pickled in Blender's user config folder so a new
+# session doesn't re-parse JSON files that haven't changed since the last one.
+# (Not next to the assets: the add-ons folder may be read-only, and a dev build
+# would ship the file.)
+_DISK_CACHE_NAME = ".ss_cache.pkl"
+_DISK_CACHE_VERSION = 1
+_disk_cache_loaded = False
+
 # Get the addon's assets directory
 def get_assets_path():
     """Returns the path to the assets directory"""
@@ -19,12 +64,91 @@ def get_assets_path():
     return os.path.join(addon_dir, "assets")
 
 def reload_assets():
-    """Force reload of asset caches"""
+    """Force a rescan of the asset folders on next access"""
     global _LIGHT_PRESETS_CACHE, _MODIFIER_PRESETS_CACHE
+    global _LIGHT_ENUM_CACHE_FOR, _MODIFIER_ENUM_CACHE_FOR
     _LIGHT_PRESETS_CACHE = None
     _MODIFIER_PRESETS_CACHE = None
+    _LIGHT_ENUM_CACHE_FOR = None
+    _MODIFIER_ENUM_CACHE_FOR = None
+    _PRESET_OBJ_CACHE.clear()
+    # Thumbnails may have been added, removed or replaced
+    if _PREVIEWS is not None:
+        _PREVIEWS.clear()
+    _PREVIEW_MISSING.clear()
     print(f"Sim Studio: Assets reloaded from {get_assets_path()}")
 
+def _disk_cache_path():
+    cache_dir = bpy.utils.user_resource('CONFIG', path="simstudio", create=True)
+    return os.path.join(cache_dir, _DISK_CACHE_NAME)
+
+def _load_disk_cache():
+    """Seed _PRESET_FILE_CACHE from the pickled cache (once per session)"""
+    global _disk_cache_loaded
+    if _disk_cache_loaded:
+        return
+    _disk_cache_loaded = True
+    try:
+        with open(_disk_cache_path(), 'rb') as f:
+            version, folders = pickle.load(f)
+    except Exception:
+        # Missing, unreadable, or pickled by another version (unpickling can raise
+        # almost anything): start from an empty cache and parse the JSON
+        return
+    if version == _DISK_CACHE_VERSION and isinstance(folders, dict):
+        for folder, files in folders.items():
+            _PRESET_FILE_CACHE.setdefault(folder, files)
+
+def _save_disk_cache():
+    path = _disk_cache_path()
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((_DISK_CACHE_VERSION, _PRESET_FILE_CACHE), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Unwritable config folder: the in-memory cache still works
+        print(f"Sim Studio: Could not write preset cache: {e}")
+
+def _file_signature(files):
+    return {name: entry[:2] for name, entry in files.items()}
+
+def _scan_json_folder(folder):
+    """
+    Returns (filename, data) pairs for every JSON file in folder.
+    Files whose mtime and size are unchanged since the last scan are not re-read.
+    """
+    if not os.path.isdir(folder):
+        return []
+    
+    _load_disk_cache()
+    previous = _PRESET_FILE_CACHE.get(folder, {})
+    current = {}
+    results = []
+    
+    with os.scandir(folder) as it:
+        for entry in it:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                st = entry.stat()
+                cached = previous.get(entry.name)
+                if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                    data = cached[2]
+                else:
+                    with open(entry.path, 'rb') as f:
+                        data = _json_loads(f.read())
+                current[entry.name] = (st.st_mtime_ns, st.st_size, data)
+                results.append((entry.name, data))
+            except Exception as e:
+                print(f"Error loading preset {entry.name}: {e}")
+    
+    _PRESET_FILE_CACHE[folder] = current
+    # Only rewrite the pickle when a file was added, removed or modified
+    if _file_signature(current) != _file_signature(previous):
+        _save_disk_cache()
+    return results
+
 def get_light_presets():
     """Returns a list of available light presets (cached)"""
     global _LIGHT_PRESETS_CACHE
@@ -34,20 +158,12 @@ def get_light_presets():
     lights_path = os.path.join(get_assets_path(), "lights")
     presets = []
     
-    if os.path.exists(lights_path):
-        for filename in os.listdir(lights_path):
-            if filename.endswith(".json"):
-                filepath = os.path.join(lights_path, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        presets.append({
-                            'file': filename,
-                            'name': data.get('name', filename),
-                            'data': data
-                        })
-                except Exception as e:
-                    print(f"Error loading preset {filename}: {e}")
+    for filename, data in _scan_json_folder(lights_path):
+        presets.append({
+            'file': filename,
+            'name': data.get('name', filename),
+            'data': data
+        })
     
     # Sort by name
     presets.sort(key=lambda x: x['name'])
@@ -63,21 +179,13 @@ def get_modifier_presets():
     modifiers_path = os.path.join(get_assets_path(), "modifiers")
     presets = []
     
-    if os.path.exists(modifiers_path):
-        for filename in os.listdir(modifiers_path):
-            if filename.endswith(".json"):
-                filepath = os.path.join(modifiers_path, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        presets.append({
-                            'file': filename,
-                            'name': data.get('name', filename),
-                            'type': data.get('type', 'unknown'),
-                            'data': data
-                        })
-                except Exception as e:
-                    print(f"Error loading modifier {filename}: {e}")
+    for filename, data in _scan_json_folder(modifiers_path):
+        presets.append({
+            'file': filename,
+            'name': data.get('name', filename),
+            'type': data.get('type', 'unknown'),
+            'data': data
+        })
     
     # Sort by name
     presets.sort(key=lambda x: x['name'])
@@ -85,72 +193,263 @@ def get_modifier_presets():
     return presets
 
 def load_preset_by_name(preset_name, preset_type='light'):
-    """Load a specific preset by name"""
-    if preset_type == 'light':
-        presets = get_light_presets()
-    else:
-        presets = get_modifier_presets()
+    """
+    Load a specific preset by name.
+    The returned dict is shared with the cache: callers must not mutate it.
+    """
+    index = _PRESET_OBJ_CACHE.get(preset_type)
+    if index is None:
+        if preset_type == 'light':
+            presets = get_light_presets()
+        else:
+            presets = get_modifier_presets()
+        
+        index = {}
+        for preset in presets:
+            # First match wins, as with the previous linear search
+            index.setdefault(preset['name'], preset['data'])
+        _PRESET_OBJ_CACHE[preset_type] = index
     
+    return index.get(preset_name)
+
+class SS_LightProps(bpy.types.PropertyGroup):
+    """Sim Studio values stored on each Light datablock (light_data.ss)"""
+    preset_name: bpy.props.StringProperty(name="Preset")
+    base_lumens: bpy.props.FloatProperty(name="Base Lumens", default=12000.0, min=0.0)
+    base_beam_angle: bpy.props.FloatProperty(name="Base Beam Angle", default=120.0, min=0.0, max=180.0)
+    power_watts: bpy.props.FloatProperty(name="Power (W)", default=0.0, min=0.0)
+    power_percent: bpy.props.FloatProperty(name="Power %", default=100.0, min=0.0, max=100.0, subtype='PERCENTAGE')
+    effective_lumens: bpy.props.FloatProperty(name="Effective Lumens", default=0.0, min=0.0)
+    modifiers: bpy.props.StringProperty(name="Modifiers")
+    modifier_count: bpy.props.IntProperty(name="Modifier Count", default=0, min=0)
+
+class SS_PresetItem(bpy.types.PropertyGroup):
+    """One light preset row for the library UIList (name only; data stays in the cache)"""
+    pass
+
+# Light preset list the UIList items were last synced from
+_LIGHT_ITEMS_FOR = None
+
+def light_preset_items_stale(wm):
+    """True if wm.ss_light_preset_items no longer mirrors get_light_presets()"""
+    presets = get_light_presets()
+    return _LIGHT_ITEMS_FOR is not presets or len(wm.ss_light_preset_items) != len(presets)
+
+def sync_light_preset_items():
+    """Mirror the cached light presets into the WindowManager collection (not callable from draw)"""
+    global _LIGHT_ITEMS_FOR
+    wm = bpy.context.window_manager
+    if wm is None:
+        return None
+    presets = get_light_presets()
+    items = wm.ss_light_preset_items
+    items.clear()
     for preset in presets:
-        if preset['name'] == preset_name:
-            return preset['data']
+        items.add().name = preset['name']
+    _LIGHT_ITEMS_FOR = presets
+    _tag_view3d_redraw(wm)
+    return None  # One-shot when used as a timer
+
+def _tag_view3d_redraw(wm):
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+# Light preset thumbnails: an optional PNG next to the preset JSON (cob_100w.json -> cob_100w.png).
+# Nothing is read at register; a thumbnail is loaded the first time its row is drawn.
+_PREVIEWS = None
+_PREVIEW_QUEUE = []       # preset names waiting for _load_queued_previews()
+_PREVIEW_MISSING = set()  # preset names without a thumbnail file
+
+def preset_icon_id(preset_name):
+    """icon_value of a light preset's thumbnail, or 0 if it has none (yet)"""
+    if _PREVIEWS is None:
+        return 0
+    preview = _PREVIEWS.get(preset_name)
+    if preview is not None:
+        return preview.icon_id
+    if preset_name not in _PREVIEW_MISSING and preset_name not in _PREVIEW_QUEUE:
+        _PREVIEW_QUEUE.append(preset_name)
+        if not bpy.app.timers.is_registered(_load_queued_previews):
+            bpy.app.timers.register(_load_queued_previews, first_interval=0.01)
+    return 0
+
+def _load_queued_previews():
+    """Load the thumbnails requested by preset_icon_id() (one-shot timer)"""
+    if _PREVIEWS is None:
+        _PREVIEW_QUEUE.clear()
+        return None
+    
+    lights_path = os.path.join(get_assets_path(), "lights")
+    files = {preset['name']: preset['file'] for preset in get_light_presets()}
+    for name in _PREVIEW_QUEUE:
+        filename = files.get(name)
+        path = os.path.join(lights_path, os.path.splitext(filename)[0] + ".png") if filename else None
+        if path and os.path.isfile(path):
+            _PREVIEWS.load(name, path, 'IMAGE')
+        else:
+            _PREVIEW_MISSING.add(name)
+    _PREVIEW_QUEUE.clear()
+    
+    wm = bpy.context.window_manager
+    if wm is not None:
+        _tag_view3d_redraw(wm)
     return None
 
-def apply_light_preset(light_data, preset_data):
-    """Apply a COB light preset to a Blender light"""
+# Legacy ID-property keys -> SS_LightProps attribute
+_LEGACY_KEYS = (
+    ('ss_preset_name', 'preset_name'),
+    ('ss_base_lumens', 'base_lumens'),
+    ('ss_base_beam_angle', 'base_beam_angle'),
+    ('ss_power_watts', 'power_watts'),
+    ('ss_power_percent', 'power_percent'),
+    ('ss_effective_lumens', 'effective_lumens'),
+    ('ss_modifiers', 'modifiers'),
+    ('ss_modifier_count', 'modifier_count'),
+)
+
+def migrate_legacy_props(light_data):
+    """Move ss_* ID-properties from older files into light_data.ss"""
+    found = [(key, attr) for key, attr in _LEGACY_KEYS if key in light_data]
+    if not found:
+        return False
+    
+    ss = light_data.ss
+    for key, attr in found:
+        setattr(ss, attr, light_data[key])
+        del light_data[key]
+    # Files from before the modifier counter existed
+    if 'ss_modifier_count' not in dict(found) and ss.modifiers:
+        ss.modifier_count = ss.modifiers.count(',') + 1
+    return True
+
+@persistent
+def _migrate_on_load(_dummy):
+    for light_data in bpy.data.lights:
+        if light_data.library is None:  # linked data is read-only
+            migrate_legacy_props(light_data)
+
+def register_props():
+    global _PREVIEWS
+    _PREVIEWS = bpy.utils.previews.new()
+    bpy.types.Light.ss = bpy.props.PointerProperty(type=SS_LightProps)
+    bpy.types.WindowManager.ss_light_preset_items = bpy.props.CollectionProperty(type=SS_PresetItem)
+    bpy.types.WindowManager.ss_light_preset_index = bpy.props.IntProperty(name="Light Preset")
+    bpy.app.handlers.load_post.append(_migrate_on_load)
+    # bpy.data is not accessible during registration; migrate the open file right after
+    bpy.app.timers.register(lambda: _migrate_on_load(None), first_interval=0.0)
+
+def unregister_props():
+    global _PREVIEWS
+    if _migrate_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_migrate_on_load)
+    if bpy.app.timers.is_registered(sync_light_preset_items):
+        bpy.app.timers.unregister(sync_light_preset_items)
+    if bpy.app.timers.is_registered(_load_queued_previews):
+        bpy.app.timers.unregister(_load_queued_previews)
+    if _PREVIEWS is not None:
+        bpy.utils.previews.remove(_PREVIEWS)
+        _PREVIEWS = None
+    _PREVIEW_QUEUE.clear()
+    _PREVIEW_MISSING.clear()
+    del bpy.types.WindowManager.ss_light_preset_index
+    del bpy.types.WindowManager.ss_light_preset_items
+    del bpy.types.Light.ss
+
+def _set_energy(light_data, watts):
+    # Converted RealLights have energy driven by ss_flash_power; a direct write
+    # would be overwritten on the next evaluation, so go through the driver input
+    if light_engine.is_flash_driven(light_data):
+        light_data.ss_flash_power = watts
+    else:
+        light_data.energy = watts
+
+def _base_lumens(light_data, ss):
+    # Lights that never received a preset fall back to their current energy
+    return ss.base_lumens if ss.preset_name else light_data.energy * 100
+
+def apply_light_preset(light_data, preset_data, defer_update=False):
+    """
+    Apply a COB light preset to a Blender light.
+    Pass defer_update=True when applying to several lights in a row and call
+    bpy.context.view_layer.update() once afterwards.
+    """
     if not preset_data or 'specs' not in preset_data:
         return False
     
+    type_changed = light_data.type != 'SPOT'
+    _apply_light_preset_no_update(light_data, preset_data)
+    
+    if type_changed and not defer_update:
+        bpy.context.view_layer.update()
+    
+    return True
+
+def _apply_light_preset_no_update(light_data, preset_data):
+    """Mutate light properties from a preset without forcing a depsgraph update"""
     specs = preset_data['specs']
     
     # Convert to SPOT for beam angle control
-    original_type = light_data.type
-    if original_type != 'SPOT':
+    if light_data.type != 'SPOT':
         light_data.type = 'SPOT'
-        bpy.context.view_layer.update()
     
     # Store base values FIRST (before applying power percent)
+    ss = light_data.ss
     base_lumens = specs.get('lumens', 12000)
-    light_data['ss_preset_name'] = preset_data.get('name', 'Unknown')
-    light_data['ss_base_lumens'] = base_lumens
-    light_data['ss_base_beam_angle'] = specs.get('beam_angle_deg', 120)
-    light_data['ss_power_watts'] = specs.get('power_watts', 200)
-    
-    # Initialize power percent to 100% if not set
-    if 'ss_power_percent' not in light_data:
-        light_data['ss_power_percent'] = 100.0
+    ss.preset_name = preset_data.get('name', 'Unknown')
+    ss.base_lumens = base_lumens
+    ss.base_beam_angle = specs.get('beam_angle_deg', 120)
+    ss.power_watts = specs.get('power_watts', 200)
     
-    # Apply energy based on power percent
-    power_pct = light_data.get('ss_power_percent', 100.0) / 100.0
-    light_data.energy = (base_lumens * power_pct) / 100.0
-    light_data['ss_effective_lumens'] = base_lumens * power_pct
+    # Apply energy based on power percent (defaults to 100%)
+    power_pct = ss.power_percent / 100.0
+    _set_energy(light_data, (base_lumens * power_pct) / 100.0)
+    ss.effective_lumens = base_lumens * power_pct
     
     # Set color temperature
     light_data.temperature = specs.get('cct_kelvin', 5600)
     
     # Set beam angle
     if light_data.type == 'SPOT':
-        beam_angle_rad = math.radians(specs.get('beam_angle_deg', 120))
+        beam_angle_rad = _deg_to_rad(specs.get('beam_angle_deg', 120))
         light_data.spot_size = min(beam_angle_rad, math.pi)
         light_data.spot_blend = 0.15
-    
-    return True
 
 def update_power_percent(light_data):
     """Update light energy based on power percentage"""
-    base_lumens = light_data.get('ss_base_lumens', 12000)
-    power_pct = light_data.get('ss_power_percent', 100.0) / 100.0
+    ss = light_data.ss
+    power_pct = ss.power_percent / 100.0
     
     # Account for modifiers
-    modifiers = light_data.get('ss_modifiers', '')
-    modifier_loss = 0
-    if modifiers:
-        # Rough estimate: each modifier ~20% loss on average
-        modifier_loss = len(modifiers.split(',')) * 0.15
+    # Rough estimate: each modifier ~20% loss on average
+    modifier_loss = ss.modifier_count * 0.15
     
-    effective_lumens = base_lumens * power_pct * (1 - modifier_loss)
-    light_data.energy = effective_lumens / 100.0
-    light_data['ss_effective_lumens'] = effective_lumens
+    effective_lumens = ss.base_lumens * power_pct * (1 - modifier_loss)
+    _set_energy(light_data, effective_lumens / 100.0)
+    ss.effective_lumens = effective_lumens
+
+def _apply_grid(light_data, specs, base_angle):
+    # Grids override angle to their output angle
+    light_data.spot_size = _deg_to_rad(specs.get('output_beam_angle_deg', base_angle))
+    light_data.spot_blend = specs.get('edge_falloff', 0.5)
+
+def _apply_diffuser(light_data, specs, base_angle):
+    # Diffusers add to the angle
+    new_angle = min(base_angle + specs.get('beam_angle_modifier_deg', 0), 180)
+    light_data.spot_size = _deg_to_rad(new_angle)
+    light_data.spot_blend = specs.get('softness', 0.5)
+
+def _apply_softbox(light_data, specs, base_angle):
+    light_data.spot_size = _deg_to_rad(specs.get('output_beam_angle_deg', 90))
+    light_data.spot_blend = specs.get('softness', 0.75)
+
+# Beam shaping per modifier type (other types only affect output)
+_BEAM_HANDLERS = {
+    'grid': _apply_grid,
+    'diffuser': _apply_diffuser,
+    'softbox': _apply_softbox,
+}
 
 def apply_modifier_to_light(light_data, modifier_data):
     """Apply a modifier preset to a Blender light"""
@@ -159,79 +458,85 @@ def apply_modifier_to_light(light_data, modifier_data):
     
     specs = modifier_data['specs']
     mod_type = modifier_data.get('type', 'unknown')
+    mod_name = modifier_data.get('name', 'Unknown')
     
-    # Get base values
-    base_lumens = light_data.get('ss_base_lumens', light_data.energy * 100)
-    base_angle = light_data.get('ss_base_beam_angle', 120)
+    # Read all light values once up front
+    ss = light_data.ss
+    base_lumens = _base_lumens(light_data, ss)
+    base_angle = ss.base_beam_angle
+    current_mods = ss.modifiers
     
     # Calculate light loss
-    light_loss = specs.get('light_loss_percent', 0) / 100.0
+    light_loss = specs.get('light_loss_percent', 0) * 0.01
     effective_lumens = base_lumens * (1 - light_loss)
     
     # Apply energy reduction
-    light_data.energy = effective_lumens / 100.0
+    _set_energy(light_data, effective_lumens / 100.0)
     
     # Handle beam angle changes
-    if light_data.type == 'SPOT':
-        if mod_type == 'grid':
-            # Grids override angle to their output angle
-            new_angle = specs.get('output_beam_angle_deg', base_angle)
-            light_data.spot_size = math.radians(new_angle)
-            light_data.spot_blend = specs.get('edge_falloff', 0.5)
-        elif mod_type == 'diffuser':
-            # Diffusers add to the angle
-            angle_mod = specs.get('beam_angle_modifier_deg', 0)
-            new_angle = min(base_angle + angle_mod, 180)
-            light_data.spot_size = math.radians(new_angle)
-            light_data.spot_blend = specs.get('softness', 0.5)
-        elif mod_type == 'softbox':
-            new_angle = specs.get('output_beam_angle_deg', 90)
-            light_data.spot_size = math.radians(new_angle)
-            light_data.spot_blend = specs.get('softness', 0.75)
-    
-    # Store modifier info
-    current_mods = light_data.get('ss_modifiers', '')
-    if current_mods:
-        light_data['ss_modifiers'] = current_mods + ',' + modifier_data.get('name', 'Unknown')
-    else:
-        light_data['ss_modifiers'] = modifier_data.get('name', 'Unknown')
+    handler = _BEAM_HANDLERS.get(mod_type)
+    if handler is not None and light_data.type == 'SPOT':
+        handler(light_data, specs, base_angle)
     
-    light_data['ss_effective_lumens'] = effective_lumens
+    # Store modifier info (display string + running count)
+    ss.modifiers = current_mods + ',' + mod_name if current_mods else mod_name
+    ss.modifier_count += 1
+    ss.effective_lumens = effective_lumens
     
     return True
 
+@lru_cache(maxsize=64)
+def modifier_names(modifiers):
+    """Names in an ss.modifiers string, parsed once per distinct string"""
+    return tuple(name for name in (m.strip() for m in modifiers.split(',')) if name)
+
 def clear_modifiers(light_data):
     """Remove all modifiers and restore base values"""
-    base_lumens = light_data.get('ss_base_lumens', light_data.energy * 100)
-    base_angle = light_data.get('ss_base_beam_angle', 120)
+    ss = light_data.ss
+    base_lumens = _base_lumens(light_data, ss)
     
-    light_data.energy = base_lumens / 100.0
+    _set_energy(light_data, base_lumens / 100.0)
     
     if light_data.type == 'SPOT':
-        light_data.spot_size = math.radians(base_angle)
+        light_data.spot_size = _deg_to_rad(ss.base_beam_angle)
         light_data.spot_blend = 0.15
     
-    light_data['ss_modifiers'] = ''
-    light_data['ss_effective_lumens'] = base_lumens
+    ss.modifiers = ''
+    ss.modifier_count = 0
+    ss.effective_lumens = base_lumens
 
 def get_enum_items_lights(self, context):
     """Generate enum items for light presets dropdown"""
+    global _LIGHT_ENUM_CACHE, _LIGHT_ENUM_CACHE_FOR
+    presets = get_light_presets()
+    if _LIGHT_ENUM_CACHE_FOR is presets:
+        return _LIGHT_ENUM_CACHE
+    
     items = [('NONE', 'Select Preset...', 'Choose a COB light preset')]
-    for preset in get_light_presets():
+    for preset in presets:
         items.append((
             preset['file'].replace('.json', ''),
             preset['name'],
             f"Apply {preset['name']} settings"
         ))
+    _LIGHT_ENUM_CACHE = items
+    _LIGHT_ENUM_CACHE_FOR = presets
     return items
 
 def get_enum_items_modifiers(self, context):
     """Generate enum items for modifier presets dropdown"""
+    global _MODIFIER_ENUM_CACHE, _MODIFIER_ENUM_CACHE_FOR
+    presets = get_modifier_presets()
+    if _MODIFIER_ENUM_CACHE_FOR is presets:
+        return _MODIFIER_ENUM_CACHE
+    
     items = [('NONE', 'Select Modifier...', 'Choose a modifier to add')]
-    for preset in get_modifier_presets():
+    for preset in presets:
         items.append((
             preset['file'].replace('.json', ''),
             preset['name'],
             f"{preset['data'].get('description', 'Add modifier')}"
         ))
+    _MODIFIER_ENUM_CACHE = items
+    _MODIFIER_ENUM_CACHE_FOR = presets
     return items
@@ -1,23 +1,30 @@
 import bpy
 import math
+from functools import lru_cache
 
 def calculate_ev(iso, aperture, shutter_speed):
+    """
+    Cached EV lookup for UI/redraw use.
+    Inputs are quantized so float noise from sliders still hits the cache.
+    """
+    return _calculate_ev_cached(int(iso), round(aperture, 3), round(shutter_speed, 6))
+
+@lru_cache(maxsize=128)
+def _calculate_ev_cached(iso, aperture, shutter_speed):
+    return _calculate_ev_impl(iso, aperture, shutter_speed)
+
+def _calculate_ev_impl(iso, aperture, shutter_speed):
     """
     Calculate EV (Exposure Value) based on camera settings.
-    EV = log2(N^2 / t) - log2(ISO/100)
+    EV = log2(N^2 / t) - log2(ISO/100) = log2(N^2 * 100 / (t * ISO))
     """
     # Safety checks
-    if shutter_speed <= 0: shutter_speed = 0.001
-    if iso <= 0: iso = 100
-    if aperture <= 0: aperture = 1.4
-    
-    # EV at ISO 100
-    ev_100 = math.log2((aperture ** 2) / shutter_speed)
-    
-    # ISO adjustment
-    iso_shift = math.log2(iso / 100.0)
+    shutter_speed = shutter_speed if shutter_speed > 0 else 0.001
+    iso = iso if iso > 0 else 100
+    aperture = aperture if aperture > 0 else 1.4
     
-    return ev_100 - iso_shift
+    # Single log2 for both the ISO 100 EV and the ISO shift
+    return math.log2((aperture * aperture * 100.0) / (shutter_speed * iso))
 
 class SS_OT_apply_exposure(bpy.types.Operator):
     """Apply Physical Camera Exposure to Scene"""
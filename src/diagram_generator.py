@@ -1,60 +1,90 @@
 import bpy
+import io
 import os
+import numpy as np
+
+# SVG Settings
+SVG_WIDTH = 800
+SVG_HEIGHT = 600
+SVG_SCALE = 50.0  # 1 meter = 50 pixels
+
+# Constant document header/footer, formatted once at import
+_SVG_HEADER = (
+    f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{SVG_HEIGHT}" viewBox="0 0 {SVG_WIDTH} {SVG_HEIGHT}">\n'
+    '<rect width="100%" height="100%" fill="#f0f0f0" />\n'  # Background
+    f'<g transform="translate({SVG_WIDTH / 2}, {SVG_HEIGHT / 2}) scale(1, -1)">\n'  # Center and Flip Y for Cartesian
+    # Grid lines (Optional)
+    '<line x1="-400" y1="0" x2="400" y2="0" stroke="#ccc" stroke-width="1" />\n'
+    '<line x1="0" y1="-300" x2="0" y2="300" stroke="#ccc" stroke-width="1" />\n'
+)
+_SVG_FOOTER = '</g>\n</svg>'
+
+# Per-object SVG templates (formatted with x, y and name)
+LIGHT_TMPL = (
+    '<circle cx="{x:.2f}" cy="{y:.2f}" r="15" fill="#FFD700" stroke="#000" stroke-width="2" />\n'
+    '<text x="{x:.2f}" y="{y:.2f}" transform="scale(1, -1)" fill="black" font-size="12" text-anchor="middle" dy="-20">{n}</text>\n'
+)
+CAMERA_TMPL = '<rect x="{x0:.2f}" y="{y0:.2f}" width="20" height="20" fill="#4682B4" stroke="#000" stroke-width="2" />\n'
+
+def _emit_light(w, obj, x, y):
+    # Yellow Circle + Label
+    w(LIGHT_TMPL.format(x=x, y=y, n=obj.name))
+
+def _emit_camera(w, obj, x, y):
+    # Blue Rect
+    w(CAMERA_TMPL.format(x0=x - 10, y0=y - 10))
+
+# Only these types are drawn; generic meshes are skipped to keep the diagram clean
+_EMITTERS = {
+    'LIGHT': _emit_light,
+    'CAMERA': _emit_camera,
+}
 
 def create_svg_content(context):
+    """Generates the diagram as an SVG string (see write_svg)"""
+    buf = io.StringIO()
+    write_svg(context, buf)
+    return buf.getvalue()
+
+# Objects scaled per NumPy pass; bounds memory use regardless of scene size
+_CHUNK_SIZE = 1024
+
+def write_svg(context, fh):
     """
-    Generates SVG string from current scene objects.
+    Writes the SVG for the current scene objects to the text file handle fh.
     Maps World (X, Y) to SVG (X, Y).
+    Objects are written in fixed-size chunks as the scene is walked, so memory
+    use stays constant however many objects the scene holds.
     """
     scene = context.scene
     
-    # SVG Settings
-    width = 800
-    height = 600
-    scale = 50.0  # 1 meter = 50 pixels
-    center_x = width / 2
-    center_y = height / 2
+    w = fh.write
     
-    # Header
-    svg_lines = [
-        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
-        f'<rect width="100%" height="100%" fill="#f0f0f0" />', # Background
-        f'<g transform="translate({center_x}, {center_y}) scale(1, -1)">', # Center and Flip Y for Cartesian
-        # Grid lines (Optional)
-        f'<line x1="-400" y1="0" x2="400" y2="0" stroke="#ccc" stroke-width="1" />',
-        f'<line x1="0" y1="-300" x2="0" y2="300" stroke="#ccc" stroke-width="1" />'
-    ]
+    w(_SVG_HEADER)
     
-    # Collect Objects
+    get_emitter = _EMITTERS.get
+    coords = np.empty((_CHUNK_SIZE, 3), dtype=np.float64)
+    chunk = []
     for obj in scene.objects:
-        if obj.hide_viewport:
+        emit = get_emitter(obj.type)
+        if emit is None or obj.hide_viewport:
             continue
+        coords[len(chunk)] = obj.location
+        chunk.append((emit, obj))
+        if len(chunk) == _CHUNK_SIZE:
+            _emit_chunk(w, chunk, coords)
+            chunk.clear()
+    if chunk:
+        _emit_chunk(w, chunk, coords)
             
-        x = obj.location.x * scale
-        y = obj.location.y * scale
-        
-        # Determine Color/Shape based on type
-        if obj.type == 'LIGHT':
-            # Yellow Circle
-            svg_lines.append(f'<circle cx="{x:.2f}" cy="{y:.2f}" r="15" fill="#FFD700" stroke="#000" stroke-width="2" />')
-            # Label
-            svg_lines.append(f'<text x="{x:.2f}" y="{y:.2f}" transform="scale(1, -1)" fill="black" font-size="12" text-anchor="middle" dy="-20">{obj.name}</text>')
-            
-        elif obj.type == 'CAMERA':
-            # Blue Rect
-            svg_lines.append(f'<rect x="{x-10:.2f}" y="{y-10:.2f}" width="20" height="20" fill="#4682B4" stroke="#000" stroke-width="2" />')
-            
-        elif obj.type == 'MESH':
-            # Check if it's a stand or modifier?
-            # For now just small gray circle for reference if selected?
-            # Skip generic meshes to clean up diagram
-            pass
-            
-    # Footer
-    svg_lines.append('</g>')
-    svg_lines.append('</svg>')
-    
-    return "\n".join(svg_lines)
+    w(_SVG_FOOTER)
+
+def _emit_chunk(w, chunk, coords):
+    # Scale the chunk's positions in one vectorized pass, then write its objects
+    n = len(chunk)
+    xy = coords[:n, :2] * SVG_SCALE
+    for (emit, obj), (x, y) in zip(chunk, xy.tolist()):
+        emit(w, obj, x, y)
 
 class SS_OT_export_diagram(bpy.types.Operator):
     """Export 2D Lighting Diagram to SVG"""
@@ -67,11 +97,10 @@ class SS_OT_export_diagram(bpy.types.Operator):
         if not self.filepath.endswith(".svg"):
             self.filepath += ".svg"
             
-        content = create_svg_content(context)
-        
         try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Stream straight to disk; a large buffer keeps write syscalls few
+            with open(self.filepath, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                write_svg(context, f)
             self.report({'INFO'}, f"Saved diagram to {self.filepath}")
         except Exception as e:
             self.report({'ERROR'}, f"Failed to save: {str(e)}")
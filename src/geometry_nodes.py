@@ -4,15 +4,117 @@ Generates the procedural geometry for tripods and light bodies.
 """
 
 import bpy
-import math
+from bpy.app.handlers import persistent
+
+# Interface API (ng.interface) exists from Blender 4.0
+_IS_BLENDER_4 = bpy.app.version[0] >= 4
+
+# Input socket indices of built-in primitive nodes. Their order has been stable
+# since Blender 3.0, so defaults are set by index instead of by name lookup.
+# (Transform and Switch sockets changed in 4.1/4.2 and keep name access.)
+_CYL_VERTICES, _CYL_RADIUS, _CYL_DEPTH = 0, 3, 4          # GeometryNodeMeshCylinder
+_CONE_RADIUS_TOP, _CONE_RADIUS_BOTTOM, _CONE_DEPTH = 3, 4, 5  # GeometryNodeMeshCone
+_CUBE_SIZE = 0                                          # GeometryNodeMeshCube
+
+# Node groups already resolved this session, by requested name.
+# Cleared on file load, undo and redo, which free or reallocate datablocks,
+# so no stale references survive.
+_NG_CACHE = {}
+
+def _cached_node_group(name):
+    ng = _NG_CACHE.get(name)
+    if ng is None:
+        return None
+    try:
+        if ng.name == name:
+            return ng
+    except ReferenceError:
+        pass  # Datablock was removed
+    del _NG_CACHE[name]
+    return None
+
+@persistent
+def _clear_cache(*_args):
+    _NG_CACHE.clear()
+
+_CACHE_HANDLERS = ('load_post', 'undo_post', 'redo_post')
+
+def register_handlers():
+    for handler_list in _CACHE_HANDLERS:
+        getattr(bpy.app.handlers, handler_list).append(_clear_cache)
+
+def unregister_handlers():
+    for handler_list in _CACHE_HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_list)
+        if _clear_cache in handlers:
+            handlers.remove(_clear_cache)
+    _NG_CACHE.clear()
+
+# Hidden (dot-prefixed) tree built once from Python; named rig trees are copies of it
+_TEMPLATE_NAME = ".SimStudio_COB_Rig_Template"
+# Hidden group with the static primitive meshes; one datablock referenced by every rig tree
+_PRIMITIVES_NAME = ".SimStudio_COB_Rig_Primitives"
 
 def get_cob_rig_nodetree(name="SimStudio_COB_Rig"):
     """Create or return the shared Geometry Nodes tree for the COB light rig"""
-    if name in bpy.data.node_groups:
-        return bpy.data.node_groups[name]
+    ng = _find_node_group(name)
+    if ng is not None:
+        return ng
     
-    # Create new node group
-    ng = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    # A datablock copy is done in C; much cheaper than re-running construct_nodes
+    ng = _get_template().copy()
+    ng.name = name
+    ng.use_fake_user = True
+    _NG_CACHE[name] = ng
+    return ng
+
+def _find_node_group(name):
+    ng = _cached_node_group(name)
+    if ng is None:
+        ng = bpy.data.node_groups.get(name)
+        if ng is not None:
+            _NG_CACHE[name] = ng
+    return ng
+
+def _get_template():
+    ng = _cached_node_group(_TEMPLATE_NAME)
+    if ng is None:
+        # A template saved in the .blend by an older version is rebuilt in place
+        ng = bpy.data.node_groups.get(_TEMPLATE_NAME)
+        if ng is None or not _interface_matches(ng):
+            ng = build_rig_nodetree(_TEMPLATE_NAME)
+        _NG_CACHE[_TEMPLATE_NAME] = ng
+    return ng
+
+# (name, in_out, socket_type) of the rig interface, in order
+_EXPECTED_SOCKETS = (
+    ("Tripod Height", 'INPUT', 'NodeSocketFloat'),
+    ("Tilt", 'INPUT', 'NodeSocketFloat'),
+    ("Pan", 'INPUT', 'NodeSocketFloat'),
+    ("Show Diffuser", 'INPUT', 'NodeSocketBool'),
+    ("Show Frame", 'INPUT', 'NodeSocketBool'),
+    ("Geometry", 'OUTPUT', 'NodeSocketGeometry'),
+)
+
+def _interface_matches(ng):
+    if _IS_BLENDER_4:
+        schema = tuple((item.name, item.in_out, item.socket_type)
+                       for item in ng.interface.items_tree
+                       if item.item_type == 'SOCKET')
+    else:
+        schema = (tuple((s.name, 'INPUT', s.bl_idname) for s in ng.inputs)
+                  + tuple((s.name, 'OUTPUT', s.bl_idname) for s in ng.outputs))
+    return schema == _EXPECTED_SOCKETS
+
+def build_rig_nodetree(name):
+    """Create (or rebuild in place) a node group with the rig interface and nodes"""
+    ng = bpy.data.node_groups.get(name)
+    if ng is None:
+        # Create new node group
+        ng = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    elif _interface_matches(ng):
+        # Already built with the current schema; skip teardown and reconstruction
+        return ng
     
     # Enable "fake user" to keep it
     ng.use_fake_user = True
@@ -22,12 +124,14 @@ def get_cob_rig_nodetree(name="SimStudio_COB_Rig"):
     # If 4.0+, use ng.interface.new_socket
     # If < 4.0, use ng.inputs.new
     
-    is_blender_4 = bpy.app.version >= (4, 0, 0)
-    
-    if is_blender_4:
+    if _IS_BLENDER_4:
         # Clear existing interface if any (rebuilding)
-        for item in ng.interface.items_tree:
-            ng.interface.remove(item)
+        try:
+            ng.interface.clear()
+        except AttributeError:
+            # Snapshot first: removing while iterating skips items
+            for item in list(ng.interface.items_tree):
+                ng.interface.remove(item)
             
         # Tripod Height (Linear)
         sock = ng.interface.new_socket(name="Tripod Height", in_out='INPUT', socket_type='NodeSocketFloat')
@@ -76,149 +180,185 @@ def get_cob_rig_nodetree(name="SimStudio_COB_Rig"):
     
     return ng
 
+def _node_adder(nodes):
+    """Return add_node(type, location) and the flat location list it fills.
+    Locations are collected in creation order and applied in one bulk call."""
+    new_node = nodes.new
+    locations = []
+    def add_node(node_type, location):
+        locations.extend(location)
+        return new_node(node_type)
+    return add_node, locations
+
+def _set_node_locations(nodes, flat_locations):
+    """Apply flat (x, y, x, y, ...) locations to all nodes, in collection order"""
+    try:
+        nodes.foreach_set("location", flat_locations)
+    except (AttributeError, TypeError, RuntimeError):
+        for i, node in enumerate(nodes):
+            node.location = flat_locations[2 * i:2 * i + 2]
+
 def construct_nodes(ng):
     """Builds the internal nodes for the rig"""
     nodes = ng.nodes
-    links = ng.links
+    new_link = ng.links.new
+    add_node, locations = _node_adder(nodes)
     
     # Clear default nodes
     nodes.clear()
     
     # --- Input/Output ---
-    node_in = nodes.new('NodeGroupInput')
-    node_in.location = (-1000, 0)
+    node_in = add_node('NodeGroupInput', (-1000, 0))
     
-    node_out = nodes.new('NodeGroupOutput')
-    node_out.location = (1000, 0)
+    node_out = add_node('NodeGroupOutput', (1000, 0))
     
-    # --- 1. Tripod Base (Fixed Cylinder) ---
-    cyl_base = nodes.new('GeometryNodeMeshCylinder')
-    cyl_base.inputs['Vertices'].default_value = 32
-    cyl_base.inputs['Radius'].default_value = 0.05
-    cyl_base.inputs['Depth'].default_value = 1.0
-    cyl_base.location = (-600, -200)
+    # Static meshes come from one shared primitives group, so every rig tree reuses the
+    # same nodes instead of building its own (each modifier still evaluates it)
+    prims = add_node('GeometryNodeGroup', (-700, 400))
+    prims.node_tree = get_primitives_nodetree()
+    # Outputs are in the order declared by get_primitives_nodetree
+    base_mesh, cube_mesh, cone_mesh, frame_mesh = prims.outputs
     
-    trans_base = nodes.new('GeometryNodeTransform')
+    # --- 1. Tripod Base (Fixed Cylinder) ---
+    trans_base = add_node('GeometryNodeTransform', (-400, -200))
     trans_base.inputs['Translation'].default_value = (0, 0, 0.5)
-    trans_base.location = (-400, -200)
     
-    links.new(cyl_base.outputs['Mesh'], trans_base.inputs['Geometry'])
+    new_link(base_mesh, trans_base.inputs['Geometry'])
     
     # --- 2. Tripod Pole ---
     # Simplified visual: One Cylinder scaled/translated? 
     # Let's keep the user's structure or simplifying it.
-    # Just linking base for now to Main Join.
-    
-    join_geo = nodes.new('GeometryNodeJoinGeometry')
-    join_geo.location = (800, 0)
+    # Just joining base for now into Main Join (linked at the end).
     
-    links.new(trans_base.outputs['Geometry'], join_geo.inputs['Geometry'])
+    join_geo = add_node('GeometryNodeJoinGeometry', (800, 0))
     
     # --- 3. Projector Head (Cube) ---
-    cube_head = nodes.new('GeometryNodeMeshCube')
-    cube_head.inputs['Size'].default_value = (0.2, 0.2, 0.2)
-    cube_head.location = (-600, 600)
-    
-    # Offset Cube so its "Bottom" (-Z) face is at 0,0,0
-    # This ensures the Light (which is at 0,0,0) sits on the surface, not inside.
-    trans_cube_offset = nodes.new('GeometryNodeTransform')
-    trans_cube_offset.inputs['Translation'].default_value = (0, 0, 0.1) # Move up 10cm
-    trans_cube_offset.location = (-400, 600)
+    # The primitives group already offsets the Cube so its bottom face sits on the pivot.
     
     # --- 4. Modifiers Logic (Diffuser & Frame) ---
     # We will join Diffuser and Frame to the Head geometry BEFORE transforming the whole head.
     
-    join_head_parts = nodes.new('GeometryNodeJoinGeometry')
-    join_head_parts.location = (-200, 600)
-    
-    links.new(cube_head.outputs['Mesh'], trans_cube_offset.inputs['Geometry'])
-    links.new(trans_cube_offset.outputs['Geometry'], join_head_parts.inputs['Geometry'])
+    join_head_parts = add_node('GeometryNodeJoinGeometry', (-200, 600))
     
     # A. Diffuser Cone
-    cone = nodes.new('GeometryNodeMeshCone')
-    cone.inputs['Radius Bottom'].default_value = 0.3
-    cone.inputs['Radius Top'].default_value = 0.1
-    cone.inputs['Depth'].default_value = 0.4
-    cone.location = (-600, 800)
-    
-    trans_cone = nodes.new('GeometryNodeTransform')
+    trans_cone = add_node('GeometryNodeTransform', (-400, 800))
     trans_cone.inputs['Translation'].default_value = (0, 0, -0.3)
-    trans_cone.location = (-400, 800)
-    links.new(cone.outputs['Mesh'], trans_cone.inputs['Geometry'])
+    new_link(cone_mesh, trans_cone.inputs['Geometry'])
     
-    switch_diff = nodes.new('GeometryNodeSwitch')
+    switch_diff = add_node('GeometryNodeSwitch', (-200, 800))
     switch_diff.input_type = 'GEOMETRY' 
-    switch_diff.location = (-200, 800)
-    links.new(trans_cone.outputs['Geometry'], switch_diff.inputs['True'])
+    switch_diff_out = switch_diff.outputs['Output']
+    new_link(trans_cone.outputs['Geometry'], switch_diff.inputs['True'])
     
     # B. Diffusion Frame
-    # Curve Rectangle
-    rect_curve = nodes.new('GeometryNodeCurvePrimitiveQuadrilateral')
-    rect_curve.inputs['Width'].default_value = 0.6
-    rect_curve.inputs['Height'].default_value = 0.6
-    rect_curve.location = (-600, 1000)
-    
-    # Profile (Circle)
-    profile_curve = nodes.new('GeometryNodeCurvePrimitiveCircle')
-    profile_curve.inputs['Radius'].default_value = 0.01
-    profile_curve.location = (-600, 900)
-    
-    # Curve to Mesh
-    curve_to_mesh = nodes.new('GeometryNodeCurveToMesh')
-    curve_to_mesh.location = (-400, 1000)
-    links.new(rect_curve.outputs['Curve'], curve_to_mesh.inputs['Curve'])
-    links.new(profile_curve.outputs['Curve'], curve_to_mesh.inputs['Profile Curve'])
-    
     # Transform Frame (Position it)
-    trans_frame = nodes.new('GeometryNodeTransform')
+    trans_frame = add_node('GeometryNodeTransform', (-200, 1000))
     trans_frame.inputs['Translation'].default_value = (0, 0, -0.55) # In front of cone
-    trans_frame.location = (-200, 1000)
-    links.new(curve_to_mesh.outputs['Mesh'], trans_frame.inputs['Geometry'])
+    new_link(frame_mesh, trans_frame.inputs['Geometry'])
     
     # Switch Frame
-    switch_frame = nodes.new('GeometryNodeSwitch')
+    switch_frame = add_node('GeometryNodeSwitch', (0, 1000))
     switch_frame.input_type = 'GEOMETRY'
-    switch_frame.location = (0, 1000)
-    links.new(trans_frame.outputs['Geometry'], switch_frame.inputs['True'])
-    
-    # Connect Switches to Head Join
-    links.new(switch_diff.outputs['Output'], join_head_parts.inputs['Geometry'])
-    links.new(switch_frame.outputs['Output'], join_head_parts.inputs['Geometry'])
+    switch_frame_out = switch_frame.outputs['Output']
+    new_link(trans_frame.outputs['Geometry'], switch_frame.inputs['True'])
     
     # --- 5. Transform Head ---
-    trans_head = nodes.new('GeometryNodeTransform')
-    trans_head.location = (200, 600)
-    links.new(join_head_parts.outputs['Geometry'], trans_head.inputs['Geometry'])
+    trans_head = add_node('GeometryNodeTransform', (200, 600))
+    new_link(join_head_parts.outputs['Geometry'], trans_head.inputs['Geometry'])
     
     # Drivers for Head Transform
     # Translation Z = Height
-    combine_xyz = nodes.new('ShaderNodeCombineXYZ')
-    combine_xyz.location = (0, 400)
+    combine_xyz = add_node('ShaderNodeCombineXYZ', (0, 400))
     
     # Rotation
-    combine_rot = nodes.new('ShaderNodeCombineXYZ')
-    combine_rot.location = (0, 500)
+    combine_rot = add_node('ShaderNodeCombineXYZ', (0, 500))
     
     # Linking Inputs
-    is_v4 = bpy.app.version >= (4, 0, 0)
-    
-    if is_v4:
-        links.new(node_in.outputs.get('Tripod Height') or node_in.outputs[0], combine_xyz.inputs['Z'])
-        links.new(node_in.outputs.get('Tilt') or node_in.outputs[1], combine_rot.inputs['X'])
-        links.new(node_in.outputs.get('Pan') or node_in.outputs[2], combine_rot.inputs['Z'])
-        links.new(node_in.outputs.get('Show Diffuser') or node_in.outputs[3], switch_diff.inputs['Switch'])
-        links.new(node_in.outputs.get('Show Frame') or node_in.outputs[4], switch_frame.inputs['Switch'])
-    else:
-        links.new(node_in.outputs[0], combine_xyz.inputs['Z'])
-        links.new(node_in.outputs[1], combine_rot.inputs['X'])
-        links.new(node_in.outputs[2], combine_rot.inputs['Z'])
-        links.new(node_in.outputs[3], switch_diff.inputs['Switch'])
-        links.new(node_in.outputs[4], switch_frame.inputs['Switch'])
+    # Socket names are guaranteed by the interface built in get_cob_rig_nodetree
+    out_map = {sock.name: sock for sock in node_in.outputs}
+    new_link(out_map['Tripod Height'], combine_xyz.inputs['Z'])
+    new_link(out_map['Tilt'], combine_rot.inputs['X'])
+    new_link(out_map['Pan'], combine_rot.inputs['Z'])
+    new_link(out_map['Show Diffuser'], switch_diff.inputs['Switch'])
+    new_link(out_map['Show Frame'], switch_frame.inputs['Switch'])
         
-    links.new(combine_xyz.outputs['Vector'], trans_head.inputs['Translation'])
-    links.new(combine_rot.outputs['Vector'], trans_head.inputs['Rotation'])
-    
-    # Final Join
-    links.new(trans_head.outputs['Geometry'], join_geo.inputs['Geometry'])
-    links.new(join_geo.outputs['Geometry'], node_out.inputs['Geometry'])
+    new_link(combine_xyz.outputs['Vector'], trans_head.inputs['Translation'])
+    new_link(combine_rot.outputs['Vector'], trans_head.inputs['Rotation'])
+    
+    # Joins
+    # Join Geometry inputs are multi-sockets that grow per link, so all join
+    # links are added here in one pass once every source node exists.
+    head_parts_in = join_head_parts.inputs['Geometry']
+    new_link(cube_mesh, head_parts_in)
+    new_link(switch_diff_out, head_parts_in)
+    new_link(switch_frame_out, head_parts_in)
+    
+    join_geo_in = join_geo.inputs['Geometry']
+    new_link(trans_base.outputs['Geometry'], join_geo_in)
+    new_link(trans_head.outputs['Geometry'], join_geo_in)
+    new_link(join_geo.outputs['Geometry'], node_out.inputs['Geometry'])
+    
+    _set_node_locations(nodes, locations)
 
+def get_primitives_nodetree():
+    """Create or return the group holding the rig's static primitive meshes"""
+    ng = _find_node_group(_PRIMITIVES_NAME)
+    if ng is not None:
+        return ng
+    
+    ng = bpy.data.node_groups.new(_PRIMITIVES_NAME, 'GeometryNodeTree')
+    ng.use_fake_user = True
+    
+    # Order matters: construct_nodes unpacks the group node outputs positionally
+    outputs = ("Base", "Cube", "Cone", "Frame")
+    if _IS_BLENDER_4:
+        for out_name in outputs:
+            ng.interface.new_socket(name=out_name, in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    else:
+        for out_name in outputs:
+            ng.outputs.new('NodeSocketGeometry', out_name)
+    
+    nodes = ng.nodes
+    new_link = ng.links.new
+    add_node, locations = _node_adder(nodes)
+    nodes.clear()
+    
+    node_out = add_node('NodeGroupOutput', (200, 0))
+    
+    # Tripod Base (Fixed Cylinder)
+    cyl_base = add_node('GeometryNodeMeshCylinder', (-200, -200))
+    cyl_in = cyl_base.inputs
+    cyl_in[_CYL_VERTICES].default_value = 32
+    cyl_in[_CYL_RADIUS].default_value = 0.05
+    cyl_in[_CYL_DEPTH].default_value = 1.0
+    
+    # Projector Head (Cube)
+    cube_head = add_node('GeometryNodeMeshCube', (-400, 0))
+    cube_head.inputs[_CUBE_SIZE].default_value = (0.2, 0.2, 0.2)
+    
+    # Offset Cube so its "Bottom" (-Z) face is at 0,0,0
+    # This ensures the Light (which is at 0,0,0) sits on the surface, not inside.
+    trans_cube_offset = add_node('GeometryNodeTransform', (-200, 0))
+    trans_cube_offset.inputs['Translation'].default_value = (0, 0, 0.1) # Move up 10cm
+    new_link(cube_head.outputs['Mesh'], trans_cube_offset.inputs['Geometry'])
+    
+    # Diffuser Cone
+    cone = add_node('GeometryNodeMeshCone', (-200, 200))
+    cone_in = cone.inputs
+    cone_in[_CONE_RADIUS_BOTTOM].default_value = 0.3
+    cone_in[_CONE_RADIUS_TOP].default_value = 0.1
+    cone_in[_CONE_DEPTH].default_value = 0.4
+    
+    # Diffusion Frame: thin slab, no curve tessellation needed
+    frame_panel = add_node('GeometryNodeMeshCube', (-200, 400))
+    frame_panel.inputs[_CUBE_SIZE].default_value = (0.6, 0.6, 0.02)
+    
+    new_link(cyl_base.outputs['Mesh'], node_out.inputs['Base'])
+    new_link(trans_cube_offset.outputs['Geometry'], node_out.inputs['Cube'])
+    new_link(cone.outputs['Mesh'], node_out.inputs['Cone'])
+    new_link(frame_panel.outputs['Mesh'], node_out.inputs['Frame'])
+    
+    _set_node_locations(nodes, locations)
+    
+    _NG_CACHE[_PRIMITIVES_NAME] = ng
+    return ng
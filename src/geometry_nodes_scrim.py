@@ -6,20 +6,118 @@ Based on Manfrotto Pro Scrim Medium specifications.
 
 import bpy
 import math
+from bpy.app.handlers import persistent
 
+# Interface API (ng.interface) and renamed Principled inputs from Blender 4.0
+_BLENDER4 = tuple(bpy.app.version) >= (4, 0, 0)
+
+# Bumped whenever the scrim interface or nodes change; stored on the tree as
+# "_ss_schema_version" so trees saved by an older version get rebuilt.
+_SCRIM_SCHEMA_VERSION = 9
+
+# Scrim trees / materials already resolved this session, by name. Cleared on file
+# load, undo and redo, which free or reallocate datablocks.
+_SCRIM_NG_CACHE = {}
+_MAT_CACHE = {}
+
+def _cached_scrim_tree(name):
+    ng = _SCRIM_NG_CACHE.get(name)
+    if ng is None:
+        return None
+    try:
+        if ng.name == name:
+            return ng
+    except ReferenceError:
+        pass  # Datablock was removed
+    del _SCRIM_NG_CACHE[name]
+    return None
+
+@persistent
+def _clear_cache(*_args):
+    _SCRIM_NG_CACHE.clear()
+    _MAT_CACHE.clear()
+
+_CACHE_HANDLERS = ('load_post', 'undo_post', 'redo_post')
+
+# Tube side counts: "LOD" in the viewport, "Render LOD" in final renders.
+# The tree picks one with an Is Viewport switch, so renders never touch modifier values.
+LOD_VIEWPORT = 8
+LOD_RENDER = 16
+
+def _input_identifiers(ng):
+    """{input socket name: identifier} of a node group, on either interface API"""
+    if _BLENDER4:
+        return {item.name: item.identifier for item in ng.interface.items_tree
+                if item.item_type == 'SOCKET' and item.in_out == 'INPUT'}
+    return {sock.name: sock.identifier for sock in ng.inputs}
+
+def register_handlers():
+    for handler_list in _CACHE_HANDLERS:
+        getattr(bpy.app.handlers, handler_list).append(_clear_cache)
+
+def unregister_handlers():
+    for handler_list in _CACHE_HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_list)
+        if _clear_cache in handlers:
+            handlers.remove(_clear_cache)
+    _SCRIM_NG_CACHE.clear()
+    _MAT_CACHE.clear()
+
+
+def _save_modifier_inputs(ng):
+    """(object name, modifier name, {input name: value}) for every modifier using ng"""
+    names = {ident: name for name, ident in _input_identifiers(ng).items()}
+    saved = []
+    for obj in bpy.data.objects:
+        for mod in obj.modifiers:
+            if getattr(mod, 'node_group', None) != ng:
+                continue
+            values = {names[key]: mod[key] for key in mod.keys() if key in names}
+            if values:
+                saved.append((obj.name, mod.name, values))
+    return saved
+
+def _restore_modifier_inputs(ng, saved):
+    """Write values from _save_modifier_inputs() back by socket name (identifiers change on rebuild)"""
+    ids = _input_identifiers(ng)
+    for obj_name, mod_name, values in saved:
+        obj = bpy.data.objects.get(obj_name)
+        mod = obj.modifiers.get(mod_name) if obj else None
+        if mod is None:
+            continue
+        mod.node_group = ng  # Re-syncs the modifier's inputs with the new interface
+        for name, value in values.items():
+            ident = ids.get(name)
+            if ident is None:
+                continue  # Input no longer exists
+            try:
+                mod[ident] = value
+            except (TypeError, ValueError):
+                pass  # Socket type changed; keep the new default
+        obj.update_tag()
 
 def create_scrim_rig_nodetree(name="SimStudio_Scrim_Rig"):
     """Create or return the Geometry Nodes tree for the scrim rig"""
-    if name in bpy.data.node_groups:
-        return bpy.data.node_groups[name]
-    
-    # Create new node group
-    ng = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    ng = _cached_scrim_tree(name)
+    if ng is not None:
+        return ng
+    
+    ng = bpy.data.node_groups.get(name)
+    if ng is not None and ng.get("_ss_schema_version") == _SCRIM_SCHEMA_VERSION:
+        _SCRIM_NG_CACHE[name] = ng
+        return ng
+    
+    if ng is None:
+        # Create new node group
+        ng = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+        saved_inputs = ()
+    else:
+        # Rebuilt in place: new sockets get new identifiers, so scrims already
+        # using this tree would fall back to the defaults without this
+        saved_inputs = _save_modifier_inputs(ng)
     ng.use_fake_user = True
     
-    is_blender_4 = bpy.app.version >= (4, 0, 0)
-    
-    if is_blender_4:
+    if _BLENDER4:
         # Clear existing interface if any
         for item in list(ng.interface.items_tree):
             ng.interface.remove(item)
@@ -42,6 +140,18 @@ def create_scrim_rig_nodetree(name="SimStudio_Scrim_Rig"):
         sock.default_value = 0.0
         sock.subtype = 'ANGLE'
         
+        # LOD - Side count of the leg and frame tubes in the viewport
+        sock = ng.interface.new_socket(name="LOD", in_out='INPUT', socket_type='NodeSocketInt')
+        sock.default_value = LOD_VIEWPORT
+        sock.min_value = 3
+        sock.max_value = 32
+        
+        # Render LOD - Side count used instead of LOD in final renders
+        sock = ng.interface.new_socket(name="Render LOD", in_out='INPUT', socket_type='NodeSocketInt')
+        sock.default_value = LOD_RENDER
+        sock.min_value = 3
+        sock.max_value = 32
+        
         # Geometry Output
         ng.interface.new_socket(name="Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
         
@@ -53,252 +163,200 @@ def create_scrim_rig_nodetree(name="SimStudio_Scrim_Rig"):
         ng.inputs[-1].default_value = 1.5
         ng.inputs.new('NodeSocketFloat', "Tilt")
         ng.inputs.new('NodeSocketFloat', "Pan")
+        ng.inputs.new('NodeSocketInt', "LOD")
+        ng.inputs[-1].default_value = LOD_VIEWPORT
+        ng.inputs.new('NodeSocketInt', "Render LOD")
+        ng.inputs[-1].default_value = LOD_RENDER
         ng.outputs.new('NodeSocketGeometry', "Geometry")
     
     # Build the node tree
     construct_scrim_nodes(ng)
     
+    ng["_ss_schema_version"] = _SCRIM_SCHEMA_VERSION
+    _restore_modifier_inputs(ng, saved_inputs)
+    _SCRIM_NG_CACHE[name] = ng
     return ng
 
 
-def construct_scrim_nodes(ng):
-    """Builds the internal nodes for the scrim rig"""
-    nodes = ng.nodes
-    links = ng.links
-    
-    nodes.clear()
+# === CONSTANTS (from Manfrotto Pro Scrim Medium specs) ===
+LEG_RADIUS = 0.0175      # 35mm diameter legs
+LEG_HEIGHT = 2.0         # Leg height (will be adjusted dynamically)
+LEG_SPACING = 1.2        # Distance between legs (slightly wider than frame)
+FRAME_TUBE_RADIUS = 0.0125  # 25mm diameter frame tubes
+PANEL_WIDTH = 1.1        # 110cm
+PANEL_HEIGHT = 2.0       # 200cm
+
+_HALF_PI = math.pi * 0.5 # 90 degrees
+
+# Scrim nodes: (key, node type, location, {input name: default value})
+_SCRIM_NODES = (
+    ('node_in', 'NodeGroupInput', (-1200, 0), {}),
+    ('node_out', 'NodeGroupOutput', (1200, 0), {}),
+    
+    # LOD: viewport or render side count for every tube
+    ('is_viewport', 'GeometryNodeIsViewport', (-1400, -300), {}),
+    ('switch_lod', 'GeometryNodeSwitch', (-1200, -300), {}),
+    
+    # SECTION 1-3: LEGS (one Cylinder instanced on 2 points, moved up by half height)
+    ('leg_points', 'GeometryNodeMeshLine', (-1000, -400),
+        {'Count': 2, 'Start Location': (-LEG_SPACING / 2, 0, LEG_HEIGHT / 2), 'Offset': (LEG_SPACING, 0, 0)}),
+    ('cyl_leg', 'GeometryNodeMeshCylinder', (-1000, -600),
+        {'Radius': LEG_RADIUS, 'Depth': LEG_HEIGHT}),
+    ('inst_legs', 'GeometryNodeInstanceOnPoints', (-800, -400), {}),
     
-    # --- Input/Output ---
-    node_in = nodes.new('NodeGroupInput')
-    node_in.location = (-1200, 0)
-    
-    node_out = nodes.new('NodeGroupOutput')
-    node_out.location = (1200, 0)
-    
-    is_blender_4 = bpy.app.version >= (4, 0, 0)
-    
-    # === CONSTANTS (from Manfrotto Pro Scrim Medium specs) ===
-    LEG_RADIUS = 0.0175      # 35mm diameter legs
-    LEG_HEIGHT = 2.0         # Leg height (will be adjusted dynamically)
-    LEG_SPACING = 1.2        # Distance between legs (slightly wider than frame)
-    FRAME_TUBE_RADIUS = 0.0125  # 25mm diameter frame tubes
-    PANEL_WIDTH = 1.1        # 110cm
-    PANEL_HEIGHT = 2.0       # 200cm
-    
-    # ============================================
-    # SECTION 1: LEFT LEG (Cylinder)
-    # ============================================
-    cyl_leg_left = nodes.new('GeometryNodeMeshCylinder')
-    cyl_leg_left.inputs['Vertices'].default_value = 16
-    cyl_leg_left.inputs['Radius'].default_value = LEG_RADIUS
-    cyl_leg_left.inputs['Depth'].default_value = LEG_HEIGHT
-    cyl_leg_left.location = (-800, -300)
-    
-    # Position left leg: move up by half height, offset left
-    trans_leg_left = nodes.new('GeometryNodeTransform')
-    trans_leg_left.inputs['Translation'].default_value = (-LEG_SPACING / 2, 0, LEG_HEIGHT / 2)
-    trans_leg_left.location = (-600, -300)
-    
-    links.new(cyl_leg_left.outputs['Mesh'], trans_leg_left.inputs['Geometry'])
-    
-    # ============================================
-    # SECTION 2: RIGHT LEG (Cylinder)
-    # ============================================
-    cyl_leg_right = nodes.new('GeometryNodeMeshCylinder')
-    cyl_leg_right.inputs['Vertices'].default_value = 16
-    cyl_leg_right.inputs['Radius'].default_value = LEG_RADIUS
-    cyl_leg_right.inputs['Depth'].default_value = LEG_HEIGHT
-    cyl_leg_right.location = (-800, -500)
-    
-    # Position right leg: move up by half height, offset right
-    trans_leg_right = nodes.new('GeometryNodeTransform')
-    trans_leg_right.inputs['Translation'].default_value = (LEG_SPACING / 2, 0, LEG_HEIGHT / 2)
-    trans_leg_right.location = (-600, -500)
-    
-    links.new(cyl_leg_right.outputs['Mesh'], trans_leg_right.inputs['Geometry'])
-    
-    # ============================================
-    # SECTION 3: JOIN LEGS
-    # ============================================
-    join_legs = nodes.new('GeometryNodeJoinGeometry')
-    join_legs.location = (-400, -400)
-    
-    links.new(trans_leg_left.outputs['Geometry'], join_legs.inputs['Geometry'])
-    links.new(trans_leg_right.outputs['Geometry'], join_legs.inputs['Geometry'])
-    
-    # ============================================
     # SECTION 4: FRAME (4 tubes forming rectangle)
-    # ============================================
-    # We'll create 4 cylinders for the frame edges
-    
-    # -- Top horizontal bar --
-    frame_top = nodes.new('GeometryNodeMeshCylinder')
-    frame_top.inputs['Vertices'].default_value = 12
-    frame_top.inputs['Radius'].default_value = FRAME_TUBE_RADIUS
-    frame_top.inputs['Depth'].default_value = PANEL_WIDTH
-    frame_top.location = (-800, 200)
-    
-    trans_frame_top = nodes.new('GeometryNodeTransform')
-    trans_frame_top.inputs['Translation'].default_value = (0, 0, PANEL_HEIGHT / 2)
-    trans_frame_top.inputs['Rotation'].default_value = (0, math.radians(90), 0)  # Rotate to horizontal
-    trans_frame_top.location = (-600, 200)
-    
-    links.new(frame_top.outputs['Mesh'], trans_frame_top.inputs['Geometry'])
-    
-    # -- Bottom horizontal bar --
-    frame_bottom = nodes.new('GeometryNodeMeshCylinder')
-    frame_bottom.inputs['Vertices'].default_value = 12
-    frame_bottom.inputs['Radius'].default_value = FRAME_TUBE_RADIUS
-    frame_bottom.inputs['Depth'].default_value = PANEL_WIDTH
-    frame_bottom.location = (-800, 50)
-    
-    trans_frame_bottom = nodes.new('GeometryNodeTransform')
-    trans_frame_bottom.inputs['Translation'].default_value = (0, 0, -PANEL_HEIGHT / 2)
-    trans_frame_bottom.inputs['Rotation'].default_value = (0, math.radians(90), 0)
-    trans_frame_bottom.location = (-600, 50)
-    
-    links.new(frame_bottom.outputs['Mesh'], trans_frame_bottom.inputs['Geometry'])
-    
-    # -- Left vertical bar --
-    frame_left = nodes.new('GeometryNodeMeshCylinder')
-    frame_left.inputs['Vertices'].default_value = 12
-    frame_left.inputs['Radius'].default_value = FRAME_TUBE_RADIUS
-    frame_left.inputs['Depth'].default_value = PANEL_HEIGHT
-    frame_left.location = (-800, -100)
-    
-    trans_frame_left = nodes.new('GeometryNodeTransform')
-    trans_frame_left.inputs['Translation'].default_value = (-PANEL_WIDTH / 2, 0, 0)
-    trans_frame_left.location = (-600, -100)
-    
-    links.new(frame_left.outputs['Mesh'], trans_frame_left.inputs['Geometry'])
-    
-    # -- Right vertical bar --
-    frame_right = nodes.new('GeometryNodeMeshCylinder')
-    frame_right.inputs['Vertices'].default_value = 12
-    frame_right.inputs['Radius'].default_value = FRAME_TUBE_RADIUS
-    frame_right.inputs['Depth'].default_value = PANEL_HEIGHT
-    frame_right.location = (-800, -200)
-    
-    trans_frame_right = nodes.new('GeometryNodeTransform')
-    trans_frame_right.inputs['Translation'].default_value = (PANEL_WIDTH / 2, 0, 0)
-    trans_frame_right.location = (-600, -200)
-    
-    links.new(frame_right.outputs['Mesh'], trans_frame_right.inputs['Geometry'])
-    
-    # ============================================
-    # SECTION 5: DIFFUSION PANEL (Plane)
-    # ============================================
-    panel = nodes.new('GeometryNodeMeshGrid')
-    panel.inputs['Size X'].default_value = PANEL_WIDTH
-    panel.inputs['Size Y'].default_value = PANEL_HEIGHT
-    panel.inputs['Vertices X'].default_value = 4
-    panel.inputs['Vertices Y'].default_value = 4
-    panel.location = (-800, 400)
-    
-    # Rotate panel to face forward (Y axis) - default grid is XY plane
-    trans_panel = nodes.new('GeometryNodeTransform')
-    trans_panel.inputs['Rotation'].default_value = (math.radians(90), 0, 0)
-    trans_panel.location = (-600, 400)
-    
-    links.new(panel.outputs['Mesh'], trans_panel.inputs['Geometry'])
-    
-    # ============================================
+    # One unit-length tube instanced on 2 horizontal + 2 vertical points,
+    # scaled along Z to the panel size (horizontals rotated flat first).
+    ('frame_tube', 'GeometryNodeMeshCylinder', (-1000, 0),
+        {'Radius': FRAME_TUBE_RADIUS, 'Depth': 1.0}),
+    # -- Top / bottom horizontal bars --
+    ('frame_rows', 'GeometryNodeMeshLine', (-1000, 200),
+        {'Count': 2, 'Start Location': (0, 0, -PANEL_HEIGHT / 2), 'Offset': (0, 0, PANEL_HEIGHT)}),
+    ('inst_frame_rows', 'GeometryNodeInstanceOnPoints', (-800, 200),
+        {'Rotation': (0, _HALF_PI, 0), 'Scale': (1, 1, PANEL_WIDTH)}),
+    # -- Left / right vertical bars --
+    ('frame_columns', 'GeometryNodeMeshLine', (-1000, -200),
+        {'Count': 2, 'Start Location': (-PANEL_WIDTH / 2, 0, 0), 'Offset': (PANEL_WIDTH, 0, 0)}),
+    ('inst_frame_columns', 'GeometryNodeInstanceOnPoints', (-800, -100),
+        {'Scale': (1, 1, PANEL_HEIGHT)}),
+    ('join_frame_tubes', 'GeometryNodeJoinGeometry', (-600, 0), {}),
+    
+    # SECTION 5: DIFFUSION PANEL (Plane), rotated to face forward (Y axis)
+    ('panel', 'GeometryNodeMeshGrid', (-800, 400),
+        {'Size X': PANEL_WIDTH, 'Size Y': PANEL_HEIGHT, 'Vertices X': 2, 'Vertices Y': 2}),  # Flat: one quad is enough
+    ('trans_panel', 'GeometryNodeTransform', (-600, 400),
+        {'Rotation': (_HALF_PI, 0, 0)}),
+    
     # SECTION 6: JOIN FRAME + PANEL
-    # ============================================
-    join_frame = nodes.new('GeometryNodeJoinGeometry')
-    join_frame.location = (-400, 200)
-    
-    links.new(trans_frame_top.outputs['Geometry'], join_frame.inputs['Geometry'])
-    links.new(trans_frame_bottom.outputs['Geometry'], join_frame.inputs['Geometry'])
-    links.new(trans_frame_left.outputs['Geometry'], join_frame.inputs['Geometry'])
-    links.new(trans_frame_right.outputs['Geometry'], join_frame.inputs['Geometry'])
-    links.new(trans_panel.outputs['Geometry'], join_frame.inputs['Geometry'])
-    
-    # ============================================
-    # SECTION 7: APPLY TILT TO FRAME ONLY
-    # ============================================
-    # Tilt rotates around local X axis (tilts forward/backward)
-    trans_frame_tilt = nodes.new('GeometryNodeTransform')
-    trans_frame_tilt.location = (-200, 200)
-    
-    # Combine XYZ for Tilt rotation
-    combine_tilt = nodes.new('ShaderNodeCombineXYZ')
-    combine_tilt.location = (-400, 350)
-    
-    if is_blender_4:
-        links.new(node_in.outputs['Tilt'], combine_tilt.inputs['X'])
-    else:
-        links.new(node_in.outputs[1], combine_tilt.inputs['X'])
+    ('join_frame', 'GeometryNodeJoinGeometry', (-400, 200), {}),
     
-    links.new(combine_tilt.outputs['Vector'], trans_frame_tilt.inputs['Rotation'])
-    links.new(join_frame.outputs['Geometry'], trans_frame_tilt.inputs['Geometry'])
+    # SECTION 7: APPLY TILT TO FRAME ONLY (around local X axis)
+    ('trans_frame_tilt', 'GeometryNodeTransform', (-200, 200), {}),
+    ('combine_tilt', 'ShaderNodeCombineXYZ', (-400, 350), {}),
     
-    # ============================================
     # SECTION 8: TRANSLATE FRAME TO HEIGHT
-    # ============================================
-    trans_frame_height = nodes.new('GeometryNodeTransform')
-    trans_frame_height.location = (0, 200)
-    
-    combine_height = nodes.new('ShaderNodeCombineXYZ')
-    combine_height.location = (-200, 350)
+    ('trans_frame_height', 'GeometryNodeTransform', (0, 200), {}),
+    ('combine_height', 'ShaderNodeCombineXYZ', (-200, 350), {}),
     
-    if is_blender_4:
-        links.new(node_in.outputs['Frame Height'], combine_height.inputs['Z'])
-    else:
-        links.new(node_in.outputs[0], combine_height.inputs['Z'])
-    
-    links.new(combine_height.outputs['Vector'], trans_frame_height.inputs['Translation'])
-    links.new(trans_frame_tilt.outputs['Geometry'], trans_frame_height.inputs['Geometry'])
-    
-    # ============================================
     # SECTION 9: JOIN LEGS + FRAME
-    # ============================================
-    join_all = nodes.new('GeometryNodeJoinGeometry')
-    join_all.location = (200, 0)
-    
-    links.new(join_legs.outputs['Geometry'], join_all.inputs['Geometry'])
-    links.new(trans_frame_height.outputs['Geometry'], join_all.inputs['Geometry'])
+    ('join_all', 'GeometryNodeJoinGeometry', (200, 0), {}),
     
-    # ============================================
     # SECTION 10: APPLY PAN TO EVERYTHING
-    # ============================================
-    trans_pan = nodes.new('GeometryNodeTransform')
-    trans_pan.location = (400, 0)
+    ('trans_pan', 'GeometryNodeTransform', (400, 0), {}),
+    ('combine_pan', 'ShaderNodeCombineXYZ', (200, 150), {}),
     
-    combine_pan = nodes.new('ShaderNodeCombineXYZ')
-    combine_pan.location = (200, 150)
-    
-    if is_blender_4:
-        links.new(node_in.outputs['Pan'], combine_pan.inputs['Z'])
-    else:
-        links.new(node_in.outputs[2], combine_pan.inputs['Z'])
-    
-    links.new(combine_pan.outputs['Vector'], trans_pan.inputs['Rotation'])
-    links.new(join_all.outputs['Geometry'], trans_pan.inputs['Geometry'])
+    # SECTION 11: SET MATERIAL (material assigned in construct_scrim_nodes)
+    ('set_material', 'GeometryNodeSetMaterial', (600, 0), {}),
+)
+
+# Node properties set before defaults and links: {key: {attribute: value}}
+_SCRIM_NODE_PROPS = {
+    'switch_lod': {'input_type': 'INT'},
+}
+
+# Scrim links: (from key, output, to key, input), in link order.
+# Outputs of 'node_in' are group interface sockets, resolved by name.
+_SCRIM_LINKS = (
+    ('is_viewport', 'Is Viewport', 'switch_lod', 'Switch'),
+    ('node_in', 'Render LOD', 'switch_lod', 'False'),
+    ('node_in', 'LOD', 'switch_lod', 'True'),
+    ('switch_lod', 'Output', 'cyl_leg', 'Vertices'),
+    ('switch_lod', 'Output', 'frame_tube', 'Vertices'),
+    
+    ('leg_points', 'Mesh', 'inst_legs', 'Points'),
+    ('cyl_leg', 'Mesh', 'inst_legs', 'Instance'),
+    
+    ('frame_rows', 'Mesh', 'inst_frame_rows', 'Points'),
+    ('frame_tube', 'Mesh', 'inst_frame_rows', 'Instance'),
+    ('frame_columns', 'Mesh', 'inst_frame_columns', 'Points'),
+    ('frame_tube', 'Mesh', 'inst_frame_columns', 'Instance'),
+    ('inst_frame_rows', 'Instances', 'join_frame_tubes', 'Geometry'),
+    ('inst_frame_columns', 'Instances', 'join_frame_tubes', 'Geometry'),
+    ('panel', 'Mesh', 'trans_panel', 'Geometry'),
+    ('join_frame_tubes', 'Geometry', 'join_frame', 'Geometry'),
+    ('trans_panel', 'Geometry', 'join_frame', 'Geometry'),
+    
+    ('node_in', 'Tilt', 'combine_tilt', 'X'),
+    ('combine_tilt', 'Vector', 'trans_frame_tilt', 'Rotation'),
+    ('join_frame', 'Geometry', 'trans_frame_tilt', 'Geometry'),
+    
+    ('node_in', 'Frame Height', 'combine_height', 'Z'),
+    ('combine_height', 'Vector', 'trans_frame_height', 'Translation'),
+    ('trans_frame_tilt', 'Geometry', 'trans_frame_height', 'Geometry'),
+    
+    ('inst_legs', 'Instances', 'join_all', 'Geometry'),
+    ('trans_frame_height', 'Geometry', 'join_all', 'Geometry'),
+    
+    ('node_in', 'Pan', 'combine_pan', 'Z'),
+    ('combine_pan', 'Vector', 'trans_pan', 'Rotation'),
+    ('join_all', 'Geometry', 'trans_pan', 'Geometry'),
+    
+    ('trans_pan', 'Geometry', 'set_material', 'Geometry'),
+    ('set_material', 'Geometry', 'node_out', 'Geometry'),
+)
+
+
+def _socket(sockets, name):
+    # Before 4.1, Switch keeps one hidden socket pair per type under the same names;
+    # take the one enabled by input_type
+    for sock in sockets:
+        if sock.name == name and sock.enabled:
+            return sock
+    return sockets[name]
+
+def construct_scrim_nodes(ng):
+    """Builds the internal nodes for the scrim rig from _SCRIM_NODES / _SCRIM_LINKS"""
+    nodes = ng.nodes
+    new_node = nodes.new
+    new_link = ng.links.new
     
-    # ============================================
-    # SECTION 11: SET MATERIAL
-    # ============================================
-    set_material = nodes.new('GeometryNodeSetMaterial')
-    set_material.location = (600, 0)
+    nodes.clear()
     
-    links.new(trans_pan.outputs['Geometry'], set_material.inputs['Geometry'])
+    registry = {}
+    for key, node_type, location, defaults in _SCRIM_NODES:
+        node = new_node(node_type)
+        node.location = location
+        for attr, value in _SCRIM_NODE_PROPS.get(key, {}).items():
+            setattr(node, attr, value)
+        if defaults:
+            node_inputs = node.inputs
+            for input_name, value in defaults.items():
+                node_inputs[input_name].default_value = value
+        registry[key] = node
+    
+    # Group Input outputs carry the interface socket names on every version, so
+    # one name map serves both APIs (no hand-kept legacy index order to drift)
+    group_inputs = {sock.name: sock for sock in registry['node_in'].outputs}
+    
+    for from_key, from_socket, to_key, to_socket in _SCRIM_LINKS:
+        if from_key == 'node_in':
+            src = group_inputs[from_socket]
+        else:
+            src = _socket(registry[from_key].outputs, from_socket)
+        new_link(src, _socket(registry[to_key].inputs, to_socket))
     
     # Create or get the diffuser material
     mat = get_or_create_diffuser_material()
     if mat:
-        set_material.inputs['Material'].default_value = mat
-    
-    # ============================================
-    # OUTPUT
-    # ============================================
-    links.new(set_material.outputs['Geometry'], node_out.inputs['Geometry'])
+        registry['set_material'].inputs['Material'].default_value = mat
 
 
 def get_or_create_diffuser_material(name="SimStudio_Diffuser_Fabric"):
     """Create or return the diffuser fabric material"""
-    if name in bpy.data.materials:
-        return bpy.data.materials[name]
+    mat = _MAT_CACHE.get(name)
+    if mat is not None:
+        try:
+            if mat.name == name:
+                return mat
+        except ReferenceError:
+            pass  # Datablock was removed
+        del _MAT_CACHE[name]
+    
+    # An existing material is used as-is: it may carry the user's edits
+    mat = bpy.data.materials.get(name)
+    if mat is not None:
+        _MAT_CACHE[name] = mat
+        return mat
     
     mat = bpy.data.materials.new(name=name)
     mat.use_nodes = True
@@ -323,7 +381,7 @@ def get_or_create_diffuser_material(name="SimStudio_Diffuser_Fabric"):
     principled.inputs['Roughness'].default_value = 0.8  # Matte fabric
     
     # Transmission for translucency (Blender 4.0+ uses different input names)
-    if bpy.app.version >= (4, 0, 0):
+    if _BLENDER4:
         if 'Transmission Weight' in principled.inputs:
             principled.inputs['Transmission Weight'].default_value = 0.5
         elif 'Transmission' in principled.inputs:
@@ -332,7 +390,7 @@ def get_or_create_diffuser_material(name="SimStudio_Diffuser_Fabric"):
         principled.inputs['Transmission'].default_value = 0.5
     
     # Subsurface for fabric-like light scattering
-    if bpy.app.version >= (4, 0, 0):
+    if _BLENDER4:
         if 'Subsurface Weight' in principled.inputs:
             principled.inputs['Subsurface Weight'].default_value = 0.1
         elif 'Subsurface' in principled.inputs:
@@ -343,4 +401,5 @@ def get_or_create_diffuser_material(name="SimStudio_Diffuser_Fabric"):
     # Link to output
     links.new(principled.outputs['BSDF'], output.inputs['Surface'])
     
+    _MAT_CACHE[name] = mat
     return mat
@@ -1,17 +1,20 @@
 import bpy
+from bpy.app.handlers import persistent
+
+# Luminous efficacy approximations (lm/W) by emitter type
+_EFFICACY = {
+    'FLASH': 35.0,     # Xenon Flash
+    'LED': 90.0,
+    'TUNGSTEN': 15.0,
+}
+_DEFAULT_EFF = 35.0
 
 def watts_to_lumens(watts, type='FLASH'):
-    # Luminous efficacy approximations
-    efficacy = 35.0  # Xenon Flash
-    if type == 'LED':
-        efficacy = 90.0
-    if type == 'TUNGSTEN':
-        efficacy = 15.0
     """
     Convert electrical Watts to Photometric Lumens based on emitter type.
     Includes simplified efficacy logic.
     """
-    return watts * efficacy
+    return watts * _EFFICACY.get(type, _DEFAULT_EFF)
 
 
 class SS_OT_convert_to_real_light(bpy.types.Operator):
@@ -34,62 +37,136 @@ class SS_OT_convert_to_real_light(bpy.types.Operator):
                 self.report({'WARNING'}, "No lights selected")
                 return {'CANCELLED'}
         
+        # Linked duplicates share one Light datablock; build its tree only once
+        converted = set()
         for obj in selected_lights:
             light_data = obj.data
-            light_data.use_nodes = True
-            tree = light_data.node_tree
-            tree.nodes.clear()
-            
-            # 1. Output Node
-            out_node = tree.nodes.new('ShaderNodeOutputLight')
-            out_node.location = (300, 0)
-            
-            # 2. Emission Node
-            emission = tree.nodes.new('ShaderNodeEmission')
-            emission.location = (0, 0)
-            emission.inputs['Strength'].default_value = 1.0
-            
-            # 3. Blackbody Node
-            blackbody = tree.nodes.new('ShaderNodeBlackbody')
-            blackbody.location = (-300, 0)
-            blackbody.name = "SS_Blackbody"
-            
-            # CRITICAL: Set initial temperature from Light's native property
-            blackbody.inputs['Temperature'].default_value = light_data.temperature
-            
-            # Add driver to link Blackbody temperature to Light's native temperature
-            # This ensures they stay in sync automatically
-            driver = blackbody.inputs['Temperature'].driver_add('default_value')
-            driver.driver.type = 'AVERAGE'
-            
-            # Add variable pointing to light.temperature
-            var = driver.driver.variables.new()
-            var.name = 'temp'
-            var.type = 'SINGLE_PROP'
-            
-            # Set the target
-            target = var.targets[0]
-            target.id_type = 'LIGHT'
-            target.id = light_data
-            target.data_path = 'temperature'
-            
-            # Simple expression: just use the temperature value
-            driver.driver.expression = 'temp'
-            
-            # Links
-            tree.links.new(blackbody.outputs['Color'], emission.inputs['Color'])
-            tree.links.new(emission.outputs['Emission'], out_node.inputs['Surface'])
-            
-            # Initialize Properties
-            light_data.ss_flash_power = 500.0
+            key = light_data.as_pointer()
+            if key not in converted:
+                converted.add(key)
+                _build_real_light_tree(light_data)
             
             self.report({'INFO'}, f"Converted {obj.name} to RealLight (Driver-linked)")
             
         return {'FINISHED'}
 
-def update_light_power(self, context):
-    """Callback when ss_flash_power changes"""
-    self.energy = self.ss_flash_power
+def _build_real_light_tree(light_data):
+    """Emission + Blackbody light node tree, temperature driven by the Light"""
+    if light_data.use_nodes and _has_real_light_tree(light_data):
+        # Already a RealLight: keep its tree, drivers and Flash Power value
+        if not is_flash_driven(light_data):
+            _add_flash_power_driver(light_data)
+        return
+    
+    light_data.use_nodes = True
+    tree = light_data.node_tree
+    tree.nodes.clear()
+    
+    # 1. Output Node
+    out_node = tree.nodes.new('ShaderNodeOutputLight')
+    out_node.location = (300, 0)
+    
+    # 2. Emission Node
+    emission = tree.nodes.new('ShaderNodeEmission')
+    emission.location = (0, 0)
+    emission.inputs['Strength'].default_value = 1.0
+    
+    # 3. Blackbody Node
+    blackbody = tree.nodes.new('ShaderNodeBlackbody')
+    blackbody.location = (-300, 0)
+    blackbody.name = "SS_Blackbody"
+    
+    # CRITICAL: Set initial temperature from Light's native property
+    blackbody.inputs['Temperature'].default_value = light_data.temperature
+    
+    # Add driver to link Blackbody temperature to Light's native temperature
+    # This ensures they stay in sync automatically
+    driver = blackbody.inputs['Temperature'].driver_add('default_value')
+    driver.driver.type = 'AVERAGE'
+    
+    # Add variable pointing to light.temperature
+    var = driver.driver.variables.new()
+    var.name = 'temp'
+    var.type = 'SINGLE_PROP'
+    
+    # Set the target
+    target = var.targets[0]
+    target.id_type = 'LIGHT'
+    target.id = light_data
+    target.data_path = 'temperature'
+    
+    # Simple expression: just use the temperature value
+    driver.driver.expression = 'temp'
+    
+    # Links
+    tree.links.new(blackbody.outputs['Color'], emission.inputs['Color'])
+    tree.links.new(emission.outputs['Emission'], out_node.inputs['Surface'])
+    
+    # Initialize Properties
+    light_data.ss_flash_power = 500.0
+    _add_flash_power_driver(light_data)
+
+def _add_flash_power_driver(light_data):
+    """Energy follows Flash Power through a driver (evaluated by Blender, no Python callback)"""
+    light_data.driver_remove('energy')
+    driver = light_data.driver_add('energy')
+    driver.driver.type = 'AVERAGE'
+    
+    var = driver.driver.variables.new()
+    var.name = 'p'
+    var.type = 'SINGLE_PROP'
+    
+    target = var.targets[0]
+    target.id_type = 'LIGHT'
+    target.id = light_data
+    target.data_path = 'ss_flash_power'
+    
+    driver.driver.expression = 'p'
+
+def is_flash_driven(light_data):
+    """True if the light's energy is driven by its ss_flash_power (converted RealLight)"""
+    anim = light_data.animation_data
+    fcurve = anim.drivers.find('energy') if anim is not None else None
+    if fcurve is None:
+        return False
+    # A user's own energy driver is not ours
+    return any(target.id == light_data and target.data_path == 'ss_flash_power'
+               for var in fcurve.driver.variables
+               for target in var.targets)
+
+def _has_real_light_tree(light_data):
+    tree = light_data.node_tree
+    if tree is None:
+        return False
+    marker = tree.nodes.get("SS_Blackbody")
+    return marker is not None and marker.type == 'BLACKBODY'
+
+@persistent
+def _migrate_flash_lights(_dummy):
+    """
+    RealLights converted by older versions followed ss_flash_power through an update
+    callback that no longer exists; give them the energy driver instead.
+    """
+    for light_data in bpy.data.lights:
+        if light_data.library is not None:  # linked data is read-only
+            continue
+        anim = light_data.animation_data
+        if anim is not None and anim.drivers.find('energy') is not None:
+            continue  # Already ours, or the user's own driver
+        if _has_real_light_tree(light_data):
+            _add_flash_power_driver(light_data)
+    return None  # One-shot when used as a timer
+
+def register_handlers():
+    bpy.app.handlers.load_post.append(_migrate_flash_lights)
+    # bpy.data is not accessible during registration; migrate the open file right after
+    bpy.app.timers.register(_migrate_flash_lights, first_interval=0.0)
+
+def unregister_handlers():
+    if _migrate_flash_lights in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_migrate_flash_lights)
+    if bpy.app.timers.is_registered(_migrate_flash_lights):
+        bpy.app.timers.unregister(_migrate_flash_lights)
 
 def menu_func(self, context):
     self.layout.operator(SS_OT_convert_to_real_light.bl_idname)
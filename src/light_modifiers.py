@@ -4,7 +4,10 @@ Operators for applying COB presets and modifiers to lights.
 """
 
 import bpy
+from bpy.app.handlers import persistent
 from . import asset_library
+from . import geometry_nodes
+from . import geometry_nodes_scrim
 
 def get_target_light(context):
     """
@@ -12,21 +15,61 @@ def get_target_light(context):
     - If active object is a Light, return it.
     - If active object is a Rig (Mesh), try to find the child Light.
     """
-    obj = context.active_object
+    return resolve_light(context.active_object)
+
+def resolve_light(obj):
+    """Return obj if it is a Light, else its first child Light (Rig), else None"""
     if not obj:
         return None
         
     if obj.type == 'LIGHT':
         return obj
     
-    # Check if it's a Rig (parent of a light or has specific prop)
-    # Simple check: Is a light parented to it?
-    if obj.children:
-        for child in obj.children:
-            if child.type == 'LIGHT':
-                return child
-                
-    return None
+    # Rig: a light parented to it (a rig has only a few children)
+    return next((child for child in obj.children if child.type == 'LIGHT'), None)
+
+# (active object name, has a target light) for the operators' poll(), which runs for every
+# button on every redraw. Dropped when objects change; the name catches active-object switches.
+_POLL_STATE = None
+
+def has_target_light(context):
+    """get_target_light(context) is not None, answered from _POLL_STATE when possible"""
+    global _POLL_STATE
+    obj = context.active_object
+    name = obj.name if obj else None
+    if _POLL_STATE is None or _POLL_STATE[0] != name:
+        _POLL_STATE = (name, resolve_light(obj) is not None)
+    return _POLL_STATE[1]
+
+@persistent
+def _on_depsgraph_update(_scene, depsgraph):
+    global _POLL_STATE
+    if _POLL_STATE is not None and depsgraph.id_type_updated('OBJECT'):
+        _POLL_STATE = None
+
+@persistent
+def _invalidate_poll_state(*_args):
+    global _POLL_STATE
+    _POLL_STATE = None
+
+_HANDLERS = (
+    ('depsgraph_update_post', _on_depsgraph_update),
+    ('undo_post', _invalidate_poll_state),
+    ('redo_post', _invalidate_poll_state),
+    ('load_post', _invalidate_poll_state),
+)
+
+def register_handlers():
+    for handler_list, func in _HANDLERS:
+        getattr(bpy.app.handlers, handler_list).append(func)
+
+def unregister_handlers():
+    global _POLL_STATE
+    for handler_list, func in _HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_list)
+        if func in handlers:
+            handlers.remove(func)
+    _POLL_STATE = None
 
 class SS_OT_apply_light_preset(bpy.types.Operator):
     """Apply a COB preset to the selected light"""
@@ -38,7 +81,7 @@ class SS_OT_apply_light_preset(bpy.types.Operator):
     
     @classmethod
     def poll(cls, context):
-        return get_target_light(context) is not None
+        return has_target_light(context)
         
     def execute(self, context):
         light_obj = get_target_light(context)
@@ -47,6 +90,7 @@ class SS_OT_apply_light_preset(bpy.types.Operator):
         light_data = light_obj.data
         preset_data = asset_library.load_preset_by_name(self.preset_name, 'light')
         
+        # Only re-evaluates the depsgraph when the light type had to change
         if asset_library.apply_light_preset(light_data, preset_data):
             self.report({'INFO'}, f"Applied preset: {self.preset_name}")
             return {'FINISHED'}
@@ -64,7 +108,7 @@ class SS_OT_add_modifier(bpy.types.Operator):
     
     @classmethod
     def poll(cls, context):
-        return get_target_light(context) is not None
+        return has_target_light(context)
         
     def execute(self, context):
         light_obj = get_target_light(context)
@@ -98,7 +142,7 @@ class SS_OT_clear_modifiers(bpy.types.Operator):
     
     @classmethod
     def poll(cls, context):
-        return get_target_light(context) is not None
+        return has_target_light(context)
         
     def execute(self, context):
         light_obj = get_target_light(context)
@@ -113,15 +157,76 @@ class SS_OT_clear_modifiers(bpy.types.Operator):
         return {'FINISHED'}
 
 # Menu for light presets
+def _draw_preset_menu(layout, presets, op_id, arg_attr):
+    """One operator entry per preset, passing the preset name through arg_attr"""
+    operator = layout.operator
+    for preset in presets:
+        name = preset['name']
+        setattr(operator(op_id, text=name), arg_attr, name)
+
+# Larger libraries are split into submenus by first letter. Neighbouring letters are
+# merged while a submenu stays within this many presets; a letter with more presets
+# than that is cut into numbered slices ("C (1)", "C (2)"), so no submenu exceeds it.
+_MENU_BUCKET_SIZE = 25
+
+# Root menu bl_idname -> (preset list the buckets were built from, bucket Menu classes)
+_BUCKET_MENUS = {}
+
+def _draw_root_menu(menu, presets, op_id, arg_attr):
+    built_for, buckets = _BUCKET_MENUS.get(menu.bl_idname, (None, ()))
+    if buckets and built_for is presets:
+        for bucket in buckets:
+            menu.layout.menu(bucket.bl_idname)
+    else:
+        # Small library, or presets rescanned since the buckets were built
+        _draw_preset_menu(menu.layout, presets, op_id, arg_attr)
+
+def _initial(preset):
+    return preset['name'][:1].upper() or '#'
+
+def _letter_buckets(presets):
+    """[(label, preset indices)], each holding at most _MENU_BUCKET_SIZE presets"""
+    by_letter = {}
+    for i, preset in enumerate(presets):
+        by_letter.setdefault(_initial(preset), []).append(i)
+    
+    size = _MENU_BUCKET_SIZE
+    buckets = []
+    first = None  # First letter of the last bucket while more letters may merge into it
+    for letter in sorted(by_letter):
+        indices = by_letter[letter]
+        if len(indices) > size:
+            for n, start in enumerate(range(0, len(indices), size), 1):
+                buckets.append((f"{letter} ({n})", indices[start:start + size]))
+            first = None
+        elif first is not None and len(buckets[-1][1]) + len(indices) <= size:
+            buckets[-1] = (f"{first}-{letter}", buckets[-1][1] + indices)
+        else:
+            first = letter
+            buckets.append((letter, list(indices)))
+    return buckets
+
+def _make_bucket_menu(root_id, index, label, indices, get_presets, op_id, arg_attr):
+    indices = tuple(indices)
+    
+    def draw(self, context):
+        presets = get_presets()
+        _draw_preset_menu(self.layout, [presets[i] for i in indices if i < len(presets)],
+                          op_id, arg_attr)
+    
+    return type(f"{root_id}_{index}", (bpy.types.Menu,), {
+        'bl_idname': f"{root_id}_{index}",
+        'bl_label': label,
+        'draw': draw,
+    })
+
 class SS_MT_light_presets(bpy.types.Menu):
     bl_label = "COB Light Presets"
     bl_idname = "SS_MT_light_presets"
 
     def draw(self, context):
-        layout = self.layout
-        for preset in asset_library.get_light_presets():
-            op = layout.operator("light.ss_apply_preset", text=preset['name'])
-            op.preset_name = preset['name']
+        _draw_root_menu(self, asset_library.get_light_presets(),
+                        "light.ss_apply_preset", "preset_name")
 
 # Menu for modifiers
 class SS_MT_modifier_presets(bpy.types.Menu):
@@ -129,10 +234,33 @@ class SS_MT_modifier_presets(bpy.types.Menu):
     bl_idname = "SS_MT_modifier_presets"
 
     def draw(self, context):
-        layout = self.layout
-        for preset in asset_library.get_modifier_presets():
-            op = layout.operator("light.ss_add_modifier", text=preset['name'])
-            op.modifier_name = preset['name']
+        _draw_root_menu(self, asset_library.get_modifier_presets(),
+                        "light.ss_add_modifier", "modifier_name")
+
+_PRESET_MENUS = (
+    (SS_MT_light_presets.bl_idname, asset_library.get_light_presets, "light.ss_apply_preset", "preset_name"),
+    (SS_MT_modifier_presets.bl_idname, asset_library.get_modifier_presets, "light.ss_add_modifier", "modifier_name"),
+)
+
+def register_preset_menus():
+    """(Re)build the alphabetical submenus from the current preset lists (not callable from draw)"""
+    unregister_preset_menus()
+    for root_id, get_presets, op_id, arg_attr in _PRESET_MENUS:
+        presets = get_presets()
+        if len(presets) <= _MENU_BUCKET_SIZE:
+            continue
+        buckets = tuple(
+            _make_bucket_menu(root_id, i, label, indices, get_presets, op_id, arg_attr)
+            for i, (label, indices) in enumerate(_letter_buckets(presets)))
+        for cls in buckets:
+            bpy.utils.register_class(cls)
+        _BUCKET_MENUS[root_id] = (presets, buckets)
+
+def unregister_preset_menus():
+    for _presets, buckets in _BUCKET_MENUS.values():
+        for cls in buckets:
+            bpy.utils.unregister_class(cls)
+    _BUCKET_MENUS.clear()
 
 class SS_OT_set_power(bpy.types.Operator):
     """Set COB Light Power Percentage"""
@@ -150,7 +278,7 @@ class SS_OT_set_power(bpy.types.Operator):
     
     @classmethod
     def poll(cls, context):
-        return get_target_light(context) is not None
+        return has_target_light(context)
     
     def invoke(self, context, event):
         return context.window_manager.invoke_props_dialog(self)
@@ -160,10 +288,41 @@ class SS_OT_set_power(bpy.types.Operator):
         if not light_obj:
             return {'CANCELLED'}
         light_data = light_obj.data
-        light_data['ss_power_percent'] = self.power_percent
+        light_data.ss.power_percent = self.power_percent
         asset_library.update_power_percent(light_data)
         return {'FINISHED'}
 
+# Node group pointer -> (group name, {input name: '["identifier"]'}).
+# The name guards against a freed group's address being reused by another one.
+_iface_cache = {}
+
+def _input_ids(ng):
+    """Return the modifier data-path suffix of each input of a node group"""
+    key = ng.as_pointer()
+    cached = _iface_cache.get(key)
+    if cached is not None and cached[0] == ng.name:
+        return cached[1]
+    
+    if bpy.app.version >= (4, 0, 0):
+        items = [item for item in ng.interface.items_tree
+                 if item.item_type == 'SOCKET' and item.in_out == 'INPUT']
+    else:
+        items = ng.inputs
+    ids = {item.name: f'["{item.identifier}"]' for item in items}
+    _iface_cache[key] = (ng.name, ids)
+    return ids
+
+def _add_rig_driver(obj, path, index, var_name, rig_obj, data_path):
+    """Drive obj.path[index] with a single rig property, exposed to the expression as var_name"""
+    d = obj.driver_add(path, index).driver
+    d.use_self = False
+    var = d.variables.new()
+    var.name = var_name
+    var.type = 'SINGLE_PROP'
+    var.targets[0].id = rig_obj
+    var.targets[0].data_path = data_path
+    d.expression = var_name
+
 class SS_OT_spawn_cob(bpy.types.Operator):
     """Spawn a new COB Light Asset"""
     bl_idname = "light.ss_spawn_cob"
@@ -173,9 +332,6 @@ class SS_OT_spawn_cob(bpy.types.Operator):
     preset_name: bpy.props.StringProperty(name="Preset Name")
     
     def execute(self, context):
-        import math
-        from . import geometry_nodes, asset_library
-        
         # 1. Load preset data
         preset_data = asset_library.load_preset_by_name(self.preset_name, 'light')
         if not preset_data:
@@ -212,51 +368,21 @@ class SS_OT_spawn_cob(bpy.types.Operator):
         # Offset logic: Pivot is at cube front face (GN offset), light is at pivot (0,0,0)
         light_obj.location = (0, 0, 0)
         
-        # Helper to find identifier (Define inside or import?)
-        def get_input_identifier(ng, name):
-            if bpy.app.version >= (4, 0, 0):
-                if hasattr(ng, 'interface'):
-                    for item in ng.interface.items_tree:
-                        if item.name == name:
-                            return f'["{item.identifier}"]' 
-            else:
-                for item in ng.inputs:
-                    if item.name == name:
-                        return f'["{item.identifier}"]'
-            return f'["{name}"]'
-
-        # Driver for Location Z -> Modifier "Tripod Height"
-        h_id = get_input_identifier(node_group, "Tripod Height")
-        d = light_obj.driver_add("location", 2)
-        var = d.driver.variables.new()
-        var.name = "h"
-        var.type = 'SINGLE_PROP'
-        var.targets[0].id = rig_obj
-        var.targets[0].data_path = f'modifiers["SimStudio Rig"]{h_id}' 
-        d.driver.expression = "h"
+        ids = _input_ids(node_group)
         
-        # Driver for Rotation X -> Modifier "Tilt"
-        tilt_id = get_input_identifier(node_group, "Tilt")
-        d = light_obj.driver_add("rotation_euler", 0)
-        var = d.driver.variables.new()
-        var.name = "tilt"
-        var.type = 'SINGLE_PROP'
-        var.targets[0].id = rig_obj
-        var.targets[0].data_path = f'modifiers["SimStudio Rig"]{tilt_id}'
-        d.driver.expression = "tilt"
+        # Location Z <- "Tripod Height", Rotation X <- "Tilt", Rotation Z <- "Pan"
+        light_obj.animation_data_create()
+        mod_path = f'modifiers["{mod.name}"]'
+        _add_rig_driver(light_obj, "location", 2, "h", rig_obj,
+                        mod_path + ids.get("Tripod Height", '["Tripod Height"]'))
+        _add_rig_driver(light_obj, "rotation_euler", 0, "tilt", rig_obj,
+                        mod_path + ids.get("Tilt", '["Tilt"]'))
+        _add_rig_driver(light_obj, "rotation_euler", 2, "pan", rig_obj,
+                        mod_path + ids.get("Pan", '["Pan"]'))
         
-        # Driver for Rotation Z -> Modifier "Pan"
-        pan_id = get_input_identifier(node_group, "Pan")
-        d = light_obj.driver_add("rotation_euler", 2) 
-        var = d.driver.variables.new()
-        var.name = "pan"
-        var.type = 'SINGLE_PROP'
-        var.targets[0].id = rig_obj
-        var.targets[0].data_path = f'modifiers["SimStudio Rig"]{pan_id}'
-        d.driver.expression = "pan"
-        
-        # 7. Select Rig
-        bpy.ops.object.select_all(action='DESELECT')
+        # 7. Select Rig (deselect only what is selected; no operator dispatch/undo push)
+        for obj in context.selected_objects:
+            obj.select_set(False)
         rig_obj.select_set(True)
         context.view_layer.objects.active = rig_obj
         
@@ -273,8 +399,6 @@ class SS_OT_spawn_diffusion_frame(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        from . import geometry_nodes_scrim
-        
         # 1. Create the Rig Object (Mesh)
         mesh = bpy.data.meshes.new("Scrim_Rig_Mesh")
         rig_obj = bpy.data.objects.new("Diffusion_Frame_110x200", mesh)
@@ -291,8 +415,9 @@ class SS_OT_spawn_diffusion_frame(bpy.types.Operator):
         rig_obj['ss_asset_name'] = 'Diffusion Frame 110x200'
         rig_obj['ss_reference'] = 'Manfrotto Pro Scrim Medium (MLLC1201K)'
         
-        # 4. Select the Rig
-        bpy.ops.object.select_all(action='DESELECT')
+        # 4. Select the Rig (deselect only what is selected; no operator dispatch/undo push)
+        for obj in context.selected_objects:
+            obj.select_set(False)
         rig_obj.select_set(True)
         context.view_layer.objects.active = rig_obj
         
@@ -308,5 +433,6 @@ class SS_OT_reload_assets(bpy.types.Operator):
     
     def execute(self, context):
         asset_library.reload_assets()
+        register_preset_menus()
         self.report({'INFO'}, "Assets reloaded")
         return {'FINISHED'}
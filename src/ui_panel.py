@@ -1,6 +1,79 @@
 import bpy
+from bpy.app.handlers import persistent
 from . import light_engine
 from . import asset_library
+from . import light_modifiers
+
+# (scene name, names of its light objects); None when an object changed since the last draw
+_lights_cache = None
+
+def _scene_lights(scene):
+    global _lights_cache
+    if _lights_cache is None or _lights_cache[0] != scene.name:
+        _lights_cache = (scene.name, tuple(o.name for o in scene.objects if o.type == 'LIGHT'))
+    # Names, not object references: those would dangle after undo / file load
+    get = scene.objects.get
+    return [obj for obj in map(get, _lights_cache[1]) if obj is not None]
+
+@persistent
+def _on_depsgraph_update(_scene, depsgraph):
+    global _lights_cache
+    if _lights_cache is not None and depsgraph.id_type_updated('OBJECT'):
+        _lights_cache = None
+
+@persistent
+def _invalidate_lights_cache(*_args):
+    global _lights_cache
+    _lights_cache = None
+
+_HANDLERS = (
+    ('depsgraph_update_post', _on_depsgraph_update),
+    ('undo_post', _invalidate_lights_cache),
+    ('redo_post', _invalidate_lights_cache),
+    ('load_post', _invalidate_lights_cache),
+)
+
+def register_handlers():
+    for handler_list, func in _HANDLERS:
+        getattr(bpy.app.handlers, handler_list).append(func)
+
+def unregister_handlers():
+    global _lights_cache
+    for handler_list, func in _HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_list)
+        if func in handlers:
+            handlers.remove(func)
+    _lights_cache = None
+
+# (power %, rated W, effective lm) -> label texts of the last draw. Redraws while a value
+# is unchanged (e.g. dragging another slider) reuse the strings instead of reformatting.
+_power_labels = (None, None)
+
+def _power_label_texts(power_pct, power_watts, eff_lumens):
+    global _power_labels
+    key = (power_pct, power_watts, eff_lumens)
+    if _power_labels[0] != key:
+        actual_watts = power_watts * (power_pct / 100.0)
+        _power_labels = (key, (
+            f"{power_pct:.0f}%",
+            f"({actual_watts:.0f}W / {power_watts:.0f}W)",
+            f"Output: {int(eff_lumens):,} lm",
+        ))
+    return _power_labels[1]
+
+class SS_UL_light_presets(bpy.types.UIList):
+    """Light library rows; only the visible window of rows is laid out"""
+    
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        # Preset thumbnail once loaded, generic icon until then (or if there is none)
+        icon_id = asset_library.preset_icon_id(item.name)
+        if icon_id:
+            row.label(text=item.name, icon_value=icon_id)
+        else:
+            row.label(text=item.name, icon='LIGHT')
+        op = row.operator("light.ss_spawn_cob", text="Add", icon='ADD')
+        op.preset_name = item.name
 
 class SS_PT_light_mixer(bpy.types.Panel):
     """Creates a Panel in the 3D View N-Panel"""
@@ -23,20 +96,18 @@ class SS_PT_light_mixer(bpy.types.Panel):
         lib_box = layout.box()
         lib_col = lib_box.column(align=True)
         
-        from . import asset_library # Ensure import is available
-        
         presets = asset_library.get_light_presets()
         if not presets:
             lib_col.label(text="No assets found", icon='ERROR')
             lib_col.label(text=f"Path: {asset_library.get_assets_path()}", icon='INFO')
         else:
-            for preset in presets:
-                # Row with Icon and Add Button
-                row = lib_col.row(align=True)
-                # We don't have real thumbnails yet, use generic icon
-                row.label(text=preset['name'], icon='LIGHT')
-                op = row.operator("light.ss_spawn_cob", text="Add", icon='ADD')
-                op.preset_name = preset['name']
+            wm = context.window_manager
+            if asset_library.light_preset_items_stale(wm):
+                # ID data can't be written from draw(); sync right after it
+                if not bpy.app.timers.is_registered(asset_library.sync_light_preset_items):
+                    bpy.app.timers.register(asset_library.sync_light_preset_items, first_interval=0.0)
+            lib_col.template_list("SS_UL_light_presets", "", wm, "ss_light_preset_items",
+                                  wm, "ss_light_preset_index", rows=6)
         
         layout.separator()
 
@@ -53,20 +124,8 @@ class SS_PT_light_mixer(bpy.types.Panel):
 
         # ===== SELECTED LIGHT SETTINGS =====
         
-        # Helper to find light
-        active_obj = context.active_object
-        light_obj = None
-        
-        # Check standard light
-        if active_obj and active_obj.type == 'LIGHT':
-            light_obj = active_obj
-        # Check Rig
-        elif active_obj and active_obj.type == 'MESH':
-             if active_obj.children:
-                 for child in active_obj.children:
-                     if child.type == 'LIGHT':
-                         light_obj = child
-                         break
+        # Active light, or the light of the active rig (same lookup as the operators' poll)
+        light_obj = light_modifiers.get_target_light(context)
         
         if light_obj:
             obj = light_obj  # Use the found light for the rest of UI
@@ -75,34 +134,35 @@ class SS_PT_light_mixer(bpy.types.Panel):
             box = layout.box()
             box.label(text="Modifier Stack", icon='MODIFIER')
             
-            # Show current preset info
-            preset_name = obj.data.get('ss_preset_name', None)
+            # Show current preset info (each value read once)
+            ss = obj.data.ss
+            preset_name = ss.preset_name
+            modifiers = ss.modifiers
             if preset_name:
                 row = box.row()
                 row.label(text=f"Base: {preset_name}", icon='LIGHT')
                 
                 # Power percentage slider
-                power_pct = obj.data.get('ss_power_percent', 100.0)
+                power_pct = ss.power_percent
+                power_watts = ss.power_watts
+                pct_text, watts_text, lumens_text = _power_label_texts(
+                    power_pct, power_watts, ss.effective_lumens)
                 row = box.row(align=True)
                 row.label(text="Power:")
                 
                 # Custom slider using operator
                 sub = row.row(align=True)
                 sub.scale_x = 2.0
-                op = sub.operator("light.ss_set_power", text=f"{power_pct:.0f}%")
+                op = sub.operator("light.ss_set_power", text=pct_text)
                 op.power_percent = power_pct
                 
                 # Show wattage info
-                power_watts = obj.data.get('ss_power_watts', 0)
                 if power_watts > 0:
-                    actual_watts = power_watts * (power_pct / 100.0)
-                    row.label(text=f"({actual_watts:.0f}W / {power_watts}W)")
+                    row.label(text=watts_text)
                 
                 # Show effective values
-                base_lumens = obj.data.get('ss_base_lumens', 0)
-                eff_lumens = obj.data.get('ss_effective_lumens', base_lumens)
-                if base_lumens > 0:
-                    box.label(text=f"Output: {int(eff_lumens):,} lm")
+                if ss.base_lumens > 0:
+                    box.label(text=lumens_text)
             else:
                  box.label(text="Light is not a SimStudio Asset", icon='INFO')
                  # box.operator("light.ss_apply_preset", text="Convert to Asset") # REMOVED per request
@@ -119,17 +179,15 @@ class SS_PT_light_mixer(bpy.types.Panel):
                 row = box.row()
                 row.menu("SS_MT_modifier_presets", text="Add Modifier", icon='MODIFIER')
                 # Check for active modifiers to enable clear button
-                if obj.data.get('ss_modifiers', ''):
+                if modifiers:
                     row.operator("light.ss_clear_modifiers", text="", icon='X')
             
             # Show active modifiers
-            modifiers = obj.data.get('ss_modifiers', '')
             if modifiers:
                 mod_box = box.box()
                 mod_box.label(text="Active Modifiers:", icon='PREFERENCES')
-                for mod in modifiers.split(','):
-                    if mod.strip():
-                        mod_box.label(text=f"  • {mod.strip()}")
+                for mod in asset_library.modifier_names(modifiers):
+                    mod_box.label(text=f"  • {mod}")
         else:
             box = layout.box()
             box.label(text="Select a light or rig to configure", icon='INFO')
@@ -166,30 +224,44 @@ class SS_PT_light_mixer(bpy.types.Panel):
 
         # ===== LIGHTS LIST =====
         layout.separator()
-        layout.label(text="Scene Lights", icon='LIGHT')
+        show_lights = scene.ss_show_lights_list
+        layout.prop(scene, "ss_show_lights_list", text="Scene Lights", icon='LIGHT',
+                    emboss=False)
+        if not show_lights:
+            return
 
-        lights = [o for o in scene.objects if o.type == 'LIGHT']
+        lights = _scene_lights(scene)
         
         if not lights:
             layout.label(text="No lights in scene", icon='INFO')
             return
 
+        max_rows = scene.ss_lights_list_max
+        hidden = len(lights) - max_rows
+        
         col = layout.column(align=True)
-        for light_obj in lights:
+        for light_obj in lights[:max_rows]:
             box = col.box()
             row = box.row()
             
-            row.prop(light_obj, "hide_viewport", text="", icon='HIDE_OFF' if not light_obj.hide_viewport else 'HIDE_ON', emboss=False)
+            light_data = light_obj.data
+            
+            row.prop(light_obj, "hide_viewport", text="", icon='HIDE_ON' if light_obj.hide_viewport else 'HIDE_OFF', emboss=False)
             row.label(text=light_obj.name)
             
             # Show preset indicator
-            preset = light_obj.data.get('ss_preset_name', None)
+            preset = light_data.ss.preset_name
             if preset:
                 row.label(text=f"[{preset}]")
             
-            if hasattr(light_obj.data, "ss_flash_power"):
-                row.prop(light_obj.data, "ss_flash_power", text="Ws")
+            if light_engine.is_flash_driven(light_data):
+                row.prop(light_data, "ss_flash_power", text="Ws")
             else:
-                row.prop(light_obj.data, "energy", text="W")
+                row.prop(light_data, "energy", text="W")
             
-            row.prop(light_obj.data, "temperature", text="K")
+            row.prop(light_data, "temperature", text="K")
+        
+        if hidden > 0:
+            row = layout.row()
+            row.label(text=f"+{hidden} more", icon='THREE_DOTS')
+            row.prop(scene, "ss_lights_list_max", text="Max")
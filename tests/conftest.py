@@ -0,0 +1,27 @@
+"""
+Tests run against the `bpy` module (pip install bpy, or Blender's bundled Python).
+They are skipped when it isn't available.
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("bpy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def addon():
+    """Empty file with the addon registered; unregistered afterwards"""
+    import bpy
+    import src
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    src.register()
+    try:
+        yield src
+    finally:
+        src.unregister()
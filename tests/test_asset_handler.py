@@ -0,0 +1,59 @@
+import bpy
+import pytest
+
+
+def _link(obj):
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def test_untagged_mesh_near_light_is_left_alone(addon):
+    light = _link(bpy.data.objects.new("Key", bpy.data.lights.new("Key", 'SPOT')))
+    mesh = _link(bpy.data.objects.new("Card", bpy.data.meshes.new("Card")))
+    mesh.location = (0.1, 0.0, 0.0)
+
+    view_layer = bpy.context.view_layer
+    view_layer.objects.active = mesh
+    view_layer.update()
+
+    assert mesh.parent is None
+    assert tuple(mesh.location) == pytest.approx((0.1, 0.0, 0.0))
+    assert light.children == ()
+
+
+def test_no_selection_handlers_registered(addon):
+    # Attaching is explicit (operator); nothing watches selection or depsgraph updates
+    for handler_list in ('depsgraph_update_post', 'load_post'):
+        for func in getattr(bpy.app.handlers, handler_list):
+            assert getattr(func, '__module__', '') != 'src.asset_handler'
+
+
+def _rigged_light(name, location):
+    rig = _link(bpy.data.objects.new(f"{name}_Rig", bpy.data.meshes.new(f"{name}_Rig")))
+    rig.location = location
+    light = _link(bpy.data.objects.new(name, bpy.data.lights.new(name, 'SPOT')))
+    light.parent = rig  # Local location stays (0, 0, 0)
+    return light
+
+
+def test_snap_uses_world_position_of_rigged_lights(addon):
+    from src import asset_handler
+
+    near = _rigged_light("Near", (5.0, 0.0, 0.0))
+    _rigged_light("Far", (-5.0, 0.0, 0.0))
+    loose = _link(bpy.data.objects.new("Loose", bpy.data.lights.new("Loose", 'SPOT')))
+    loose.location = (0.2, 0.0, 0.0)  # Unparented: local == world
+    bpy.context.view_layer.update()
+
+    single = _link(bpy.data.objects.new("Grid", bpy.data.meshes.new("Grid")))
+    single.location = (5.1, 0.0, 0.0)
+    batch = [_link(bpy.data.objects.new(f"Box{i}", bpy.data.meshes.new(f"Box{i}"))) for i in range(2)]
+    batch[0].location = (5.2, 0.0, 0.0)
+    batch[1].location = (0.1, 0.0, 0.0)
+    bpy.context.view_layer.update()
+
+    assert asset_handler.snap_modifier_to_light(single)
+    assert single.parent == near
+    assert asset_handler.snap_modifiers_to_lights(batch) == 2
+    assert batch[0].parent == near
+    assert batch[1].parent == loose
@@ -0,0 +1,35 @@
+import pytest
+
+from src import asset_library
+
+
+@pytest.fixture
+def disk_cache(addon, tmp_path, monkeypatch):
+    path = tmp_path / "cache.pkl"
+    monkeypatch.setattr(asset_library, "_disk_cache_path", lambda: str(path))
+    monkeypatch.setattr(asset_library, "_disk_cache_loaded", False)
+    monkeypatch.setattr(asset_library, "_PRESET_FILE_CACHE", {})
+    return path
+
+
+def test_unloadable_pickle_falls_back_to_empty_cache(disk_cache):
+    # Refers to a global that doesn't exist: unpickling raises AttributeError
+    disk_cache.write_bytes(b"cbuiltins\nno_such_global\n.")
+    asset_library._load_disk_cache()
+    assert asset_library._PRESET_FILE_CACHE == {}
+
+
+def test_broken_json_does_not_rewrite_cache_every_scan(disk_cache, tmp_path, monkeypatch):
+    folder = tmp_path / "lights"
+    folder.mkdir()
+    (folder / "good.json").write_text('{"name": "Good"}')
+    (folder / "broken.json").write_text('{"name": ')
+
+    saves = []
+    save = asset_library._save_disk_cache
+    monkeypatch.setattr(asset_library, "_save_disk_cache", lambda: saves.append(save()))
+
+    for _ in range(3):
+        results = asset_library._scan_json_folder(str(folder))
+        assert [name for name, _data in results] == ["good.json"]
+    assert len(saves) == 1
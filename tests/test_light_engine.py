@@ -0,0 +1,45 @@
+import bpy
+
+
+def _user_energy_driver(light_data):
+    fcurve = light_data.driver_add('energy')
+    var = fcurve.driver.variables.new()
+    var.name = 'e'
+    var.targets[0].id_type = 'LIGHT'
+    var.targets[0].id = light_data
+    var.targets[0].data_path = 'spot_size'
+    fcurve.driver.expression = 'e * 100'
+    return fcurve
+
+
+def test_user_energy_driver_is_not_flash_driven(addon):
+    from src import light_engine
+    light_data = bpy.data.lights.new("Key", 'SPOT')
+    _user_energy_driver(light_data)
+    assert not light_engine.is_flash_driven(light_data)
+
+    light_data.driver_remove('energy')
+    light_engine._add_flash_power_driver(light_data)
+    assert light_engine.is_flash_driven(light_data)
+
+
+def test_load_post_migrates_lights_converted_without_driver(addon):
+    from src import light_engine
+    light_data = bpy.data.lights.new("Old", 'SPOT')
+    light_engine._build_real_light_tree(light_data)
+    light_data.driver_remove('energy')  # As left by versions using the update callback
+    assert not light_engine.is_flash_driven(light_data)
+
+    light_engine._migrate_flash_lights(None)
+    assert light_engine.is_flash_driven(light_data)
+
+
+def test_migration_keeps_user_energy_driver(addon):
+    from src import light_engine
+    light_data = bpy.data.lights.new("Custom", 'SPOT')
+    light_engine._build_real_light_tree(light_data)
+    light_data.driver_remove('energy')
+    _user_energy_driver(light_data)
+
+    light_engine._migrate_flash_lights(None)
+    assert not light_engine.is_flash_driven(light_data)
@@ -0,0 +1,47 @@
+import bpy
+
+from src import light_modifiers
+
+
+def _presets(names):
+    return [{'name': name, 'data': {}} for name in sorted(names)]
+
+
+def test_oversized_letter_is_sliced_under_the_cap(addon):
+    size = light_modifiers._MENU_BUCKET_SIZE
+    presets = _presets([f"COB {i:03d}W" for i in range(2 * size + 5)] + ["Amber", "Blue"])
+
+    buckets = light_modifiers._letter_buckets(presets)
+
+    assert [label for label, _ in buckets] == ["A-B", "C (1)", "C (2)", "C (3)"]
+    assert all(len(indices) <= size for _, indices in buckets)
+    # Every preset lands in exactly one submenu
+    assert sorted(i for _, indices in buckets for i in indices) == list(range(len(presets)))
+
+
+def test_small_letters_merge_without_overlap(addon):
+    presets = _presets([f"{c}{i}" for c, n in zip("ABCD", (10, 10, 10, 3)) for i in range(n)])
+
+    buckets = light_modifiers._letter_buckets(presets)
+
+    assert [label for label, _ in buckets] == ["A-B", "C-D"]
+    assert [len(indices) for _, indices in buckets] == [20, 13]
+
+
+def test_resolve_light_follows_reparenting(addon):
+    scene = bpy.context.scene.collection
+    rig = bpy.data.objects.new("Rig", bpy.data.meshes.new("Rig"))
+    first = bpy.data.objects.new("First", bpy.data.lights.new("First", 'SPOT'))
+    second = bpy.data.objects.new("Second", bpy.data.lights.new("Second", 'SPOT'))
+    for obj in (rig, first, second):
+        scene.objects.link(obj)
+
+    first.parent = rig
+    assert light_modifiers.resolve_light(rig) == first
+
+    first.parent = None
+    second.parent = rig
+    assert light_modifiers.resolve_light(rig) == second
+
+    bpy.data.objects.remove(second)
+    assert light_modifiers.resolve_light(rig) is None